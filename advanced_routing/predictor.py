@@ -338,21 +338,28 @@ class PredictiveRouter:
             'complexity': getattr(request, 'complexity', None)
         }
         
-        for provider_name in available_providers:
-            try:
-                prediction = self.performance_predictor.predict_performance(
-                    provider_name, request_data
-                )
-                provider_predictions[provider_name] = prediction
-            except Exception as e:
-                logger.warning(f"Error predicting for provider {provider_name}: {str(e)}")
-                # Fallback prediction
-                provider_predictions[provider_name] = ModelPrediction(
-                    predicted_response_time=2.0,
-                    predicted_success_rate=0.9,
-                    confidence_score=0.3,
-                    feature_importance={}
-                )
+        try:
+            # Score every provider with trained models in one batched pass
+            provider_predictions = self.performance_predictor.predict_performance_batch(
+                available_providers, request_data
+            )
+        except Exception as e:
+            logger.warning(f"Error in batched prediction, predicting per provider: {str(e)}")
+            for provider_name in available_providers:
+                try:
+                    prediction = self.performance_predictor.predict_performance(
+                        provider_name, request_data
+                    )
+                    provider_predictions[provider_name] = prediction
+                except Exception as e:
+                    logger.warning(f"Error predicting for provider {provider_name}: {str(e)}")
+                    # Fallback prediction
+                    provider_predictions[provider_name] = ModelPrediction(
+                        predicted_response_time=2.0,
+                        predicted_success_rate=0.9,
+                        confidence_score=0.3,
+                        feature_importance={}
+                    )
         
         # Select optimal provider
         routing_prediction = self._select_optimal_provider(
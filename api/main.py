@@ -7,7 +7,6 @@ from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 from fastapi.responses import FileResponse
 import time
-import uuid
 from prometheus_client import Counter, Histogram, generate_latest
 from starlette.responses import Response
 
@@ -17,6 +16,10 @@ from api.routers.current_models import router as current_models_router
 
 # Import security middleware
 from middleware.security_headers import SecurityHeadersMiddleware, RateLimitSecurityMiddleware
+from utils.request_context import REQUEST_ID, CORRELATION_ID, new_request_id, resolve_correlation_id
+from utils.logging_setup import setup_logging
+
+setup_logging()
 
 # Metrics
 REQUEST_COUNT = Counter('http_requests_total', 'Total HTTP requests', ['method', 'endpoint', 'status'])
@@ -59,16 +62,21 @@ app.add_middleware(RateLimitSecurityMiddleware, requests_per_minute=120)  # Allo
 async def add_process_time_header(request: Request, call_next):
     """Add request ID and timing"""
     start_time = time.time()
-    request_id = str(uuid.uuid4())
+    request_id = new_request_id()
+    correlation_id = resolve_correlation_id(request.headers.get("X-Request-ID"))
     
-    # Add request ID to headers
+    # Bind the server request ID (and any client correlation ID) to the request context
+    REQUEST_ID.set(request_id)
+    CORRELATION_ID.set(correlation_id)
     request.state.request_id = request_id
+    request.state.correlation_id = correlation_id
     
     response = await call_next(request)
     
     process_time = time.time() - start_time
     response.headers["X-Process-Time"] = str(process_time)
-    response.headers["X-Request-ID"] = request_id
+    # Echo the client's ID back when it sent a valid one
+    response.headers["X-Request-ID"] = correlation_id or request_id
     
     # Update metrics
     REQUEST_COUNT.labels(
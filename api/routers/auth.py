@@ -30,7 +30,7 @@ from auth.jwt_handler import (
 )
 from auth.dependencies import get_current_user, require_role
 from auth.rbac_middleware import require_permission
-from utils.auth.email_service import email_service
+from utils.auth.email_service import email_service, async_email_service
 
 router = APIRouter()
 
@@ -673,7 +673,7 @@ async def forgot_password(
         user.reset_token_expires = (datetime.utcnow() + timedelta(hours=1)).isoformat()
         await db.commit()
         # Send password reset email
-        email_sent = email_service.send_password_reset_email(user.email, reset_token)
+        email_sent = await async_email_service.send_password_reset_email(user.email, reset_token)
         if email_sent:
             logger.info(f"Password reset email sent to {user.email}")
             return {"message": "If the email exists, a password reset link has been sent"}
@@ -772,7 +772,7 @@ async def send_verification_email(
     await db.commit()
     
     # Send verification email
-    email_sent = email_service.send_verification_email(user.email, verification_token)
+    email_sent = await async_email_service.send_verification_email(user.email, verification_token)
     
     if email_sent:
         return {"message": "Verification email sent"}
@@ -840,12 +840,12 @@ async def test_email(
     
     try:
         if test_type == "password_reset":
-            success = email_service.send_password_reset_email(email, test_token)
+            success = await async_email_service.send_password_reset_email(email, test_token)
         elif test_type == "verification":
-            success = email_service.send_verification_email(email, test_token)
+            success = await async_email_service.send_verification_email(email, test_token)
         elif test_type == "notification":
             # Send a generic test notification email
-            success = email_service.send_email(
+            success = await async_email_service.send_email(
                 email,
                 "Test Notification - Model Bridge",
                 f"""
@@ -946,7 +946,7 @@ async def email_health():
     """Health check for email service"""
     try:
         # Try to send a test email to the configured FROM_EMAIL (in dev mode, just logs)
-        test_result = email_service.send_email(
+        test_result = await async_email_service.send_email(
             to_email=email_service.from_email or "test@example.com",
             subject="Model Bridge Email Health Check",
             html_content="<p>This is a test email for health check.</p>"
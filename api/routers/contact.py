@@ -3,12 +3,8 @@ from pydantic import BaseModel, EmailStr
 import os
 from typing import Optional
 import logging
-import sys
-import os
 
-# Add the utils directory to the path so we can import the email service
-sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', 'utils', 'auth'))
-from email_service import email_service
+from utils.auth.email_service import async_email_service
 
 router = APIRouter()
 
@@ -119,7 +115,7 @@ async def submit_contact_form(form: ContactForm):
         """
         
         # Send email using the existing email service
-        success = email_service.send_email(
+        success = await async_email_service.send_email(
             recipient_email, 
             f"New Contact Form Submission from {form.name}", 
             html_content
@@ -3,7 +3,6 @@ Enhanced LLM API routes with SaaS features
 """
 import json
 import time
-import uuid
 from typing import Optional, Dict, Any, List
 from fastapi import APIRouter, Depends, HTTPException, Request
 from pydantic import BaseModel
@@ -17,6 +16,7 @@ from auth.dependencies import get_api_key_auth, get_current_organization
 from auth.rbac_middleware import require_permission
 from model_bridge import EnhancedModelBridge
 from utils.cache import get_cached_response, cache_response
+from utils.request_context import get_request_id
 
 router = APIRouter()
 
@@ -84,6 +84,8 @@ class AdvancedGenerationRequest(BaseModel):
 
 
 class GenerationResponse(BaseModel):
+    # Built server-side from gateway results, so routes use model_construct()
+    # and skip re-validating fields we already computed
     content: str
     model_id: str
     provider_name: str
@@ -115,7 +117,7 @@ async def generate_text(
     """Generate text using the Model Bridge with intelligent routing"""
     
     start_time = time.time()
-    request_id = str(uuid.uuid4())
+    request_id = get_request_id()
     
     try:
         # Check organization limits
@@ -135,6 +137,7 @@ async def generate_text(
         cached_response = await get_cached_response(
             request.prompt, 
             request.model, 
+            organization_id=organization.id,
             **cache_params
         )
         
@@ -144,7 +147,6 @@ async def generate_text(
             
             # Still record usage for analytics (but no cost)
             await record_usage(
-                request_id=request_id,
                 api_key=api_key,
                 organization=organization,
                 provider=cached_response["provider_name"],
@@ -160,7 +162,7 @@ async def generate_text(
                 db=db
             )
             
-            return GenerationResponse(
+            return GenerationResponse.model_construct(
                 content=cached_response["content"],
                 model_id=cached_response["model_id"],
                 provider_name=cached_response["provider_name"],
@@ -196,6 +198,7 @@ async def generate_text(
                 "total_tokens": response.total_tokens,
                 "cost": response.cost
             },
+            organization_id=organization.id,
             **cache_params
         )
         
@@ -203,7 +206,6 @@ async def generate_text(
         
         # Record usage
         await record_usage(
-            request_id=request_id,
             api_key=api_key,
             organization=organization,
             provider=response.provider_name,
@@ -219,7 +221,7 @@ async def generate_text(
             db=db
         )
         
-        return GenerationResponse(
+        return GenerationResponse.model_construct(
             content=response.content,
             model_id=response.model_id,
             provider_name=response.provider_name,
@@ -236,7 +238,6 @@ async def generate_text(
         
         # Record failed usage
         await record_usage(
-            request_id=request_id,
             api_key=api_key,
             organization=organization,
             provider="unknown",
@@ -268,7 +269,7 @@ async def generate_text_advanced(
     """Generate text using advanced routing strategies"""
     
     start_time = time.time()
-    request_id = str(uuid.uuid4())
+    request_id = get_request_id()
     
     try:
         # Check organization limits
@@ -292,6 +293,7 @@ async def generate_text_advanced(
         cached_response = await get_cached_response(
             request.prompt, 
             optimal_model, 
+            organization_id=organization.id,
             **cache_params
         )
         
@@ -299,7 +301,6 @@ async def generate_text_advanced(
             response_time_ms = int((time.time() - start_time) * 1000)
             
             await record_usage(
-                request_id=request_id,
                 api_key=api_key,
                 organization=organization,
                 provider=cached_response["provider_name"],
@@ -315,7 +316,7 @@ async def generate_text_advanced(
                 db=db
             )
             
-            return GenerationResponse(
+            return GenerationResponse.model_construct(
                 content=cached_response["content"],
                 model_id=cached_response["model_id"],
                 provider_name=cached_response["provider_name"],
@@ -361,6 +362,7 @@ async def generate_text_advanced(
                 "total_tokens": response.total_tokens,
                 "cost": response.cost
             },
+            organization_id=organization.id,
             **cache_params
         )
         
@@ -368,7 +370,6 @@ async def generate_text_advanced(
         
         # Record usage
         await record_usage(
-            request_id=request_id,
             api_key=api_key,
             organization=organization,
             provider=response.provider_name,
@@ -384,7 +385,7 @@ async def generate_text_advanced(
             db=db
         )
         
-        return GenerationResponse(
+        return GenerationResponse.model_construct(
             content=response.content,
             model_id=response.model_id,
             provider_name=response.provider_name,
@@ -410,7 +411,6 @@ async def generate_text_advanced(
         response_time_ms = int((time.time() - start_time) * 1000)
         
         await record_usage(
-            request_id=request_id,
             api_key=api_key,
             organization=organization,
             provider="unknown",
@@ -483,7 +483,7 @@ async def generate_structured_output(
     """Generate structured JSON output using the Model Bridge"""
     
     start_time = time.time()
-    request_id = str(uuid.uuid4())
+    request_id = get_request_id()
     
     try:
         # Check organization limits
@@ -504,6 +504,7 @@ async def generate_structured_output(
         cached_response = await get_cached_response(
             request.prompt, 
             request.model, 
+            organization_id=organization.id,
             **cache_params
         )
         
@@ -511,7 +512,6 @@ async def generate_structured_output(
             response_time_ms = int((time.time() - start_time) * 1000)
             
             await record_usage(
-                request_id=request_id,
                 api_key=api_key,
                 organization=organization,
                 provider=cached_response["provider_name"],
@@ -527,7 +527,7 @@ async def generate_structured_output(
                 db=db
             )
             
-            return GenerationResponse(
+            return GenerationResponse.model_construct(
                 content=cached_response["content"],
                 model_id=cached_response["model_id"],
                 provider_name=cached_response["provider_name"],
@@ -564,6 +564,7 @@ async def generate_structured_output(
                 "total_tokens": response.total_tokens,
                 "cost": response.cost
             },
+            organization_id=organization.id,
             **cache_params
         )
         
@@ -571,7 +572,6 @@ async def generate_structured_output(
         
         # Record usage
         await record_usage(
-            request_id=request_id,
             api_key=api_key,
             organization=organization,
             provider=response.provider_name,
@@ -587,7 +587,7 @@ async def generate_structured_output(
             db=db
         )
         
-        return GenerationResponse(
+        return GenerationResponse.model_construct(
             content=response.content,
             model_id=response.model_id,
             provider_name=response.provider_name,
@@ -603,7 +603,6 @@ async def generate_structured_output(
         response_time_ms = int((time.time() - start_time) * 1000)
         
         await record_usage(
-            request_id=request_id,
             api_key=api_key,
             organization=organization,
             provider="unknown",
@@ -1002,7 +1001,6 @@ async def check_plan_model_access(model_spec: str, organization: Organization, d
 
 
 async def record_usage(
-    request_id: str,
     api_key: APIKey,
     organization: Organization,
     provider: str,
@@ -1030,7 +1028,7 @@ async def record_usage(
     
     # Create usage record
     usage_record = UsageRecord(
-        request_id=request_id,
+        request_id=get_request_id(),
         api_key_id=api_key.id,
         organization_id=organization.id,
         provider=provider,
@@ -24,7 +24,7 @@ from auth.jwt_handler import (
     SECRET_KEY,
     ALGORITHM
 )
-from utils.auth.email_service import email_service
+from utils.auth.email_service import async_email_service
 
 logger = logging.getLogger("auth_service")
 
@@ -266,7 +266,7 @@ class AuthService:
             await db.commit()
             
             # Send password reset email
-            email_sent = email_service.send_password_reset_email(user.email, reset_token)
+            email_sent = await async_email_service.send_password_reset_email(user.email, reset_token)
             
             if email_sent:
                 logger.info(f"Password reset email sent to {user.email}")
@@ -8,7 +8,6 @@ from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 from fastapi.responses import FileResponse
 from dotenv import load_dotenv
-import logging
 from contextlib import asynccontextmanager
 from alembic.config import Config as AlembicConfig
 from alembic import command
@@ -19,6 +18,9 @@ load_dotenv()
 # Import routers
 from api.routers import auth, dashboard, llm, admin, billing, rbac, ab_testing, sso
 from login.working_auth import router as working_auth_router
+from utils.logging_setup import setup_logging
+
+setup_logging()
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
@@ -93,7 +95,6 @@ async def serve_react_app(path: str):
 
 if __name__ == "__main__":
     import uvicorn
-    logging.basicConfig(level=logging.INFO, format='%(asctime)s %(levelname)s %(name)s %(message)s')
     uvicorn.run(
         "main:app",
         host="0.0.0.0", 
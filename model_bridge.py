@@ -98,7 +98,7 @@ except ImportError:
     MockProvider = None
     MOCK_AVAILABLE = False
 
-from utils.config import Config
+from utils.config import config as app_config
 from utils.logging_setup import get_logger
 
 # Import advanced routing components
@@ -332,6 +332,11 @@ class EnhancedModelBridge:
         self._cost_optimization = True
         self._performance_tracking = True
         
+        # Provider health probing
+        self.health_check_concurrency = 20
+        self.health_check_timeout = 2.0  # seconds per provider
+        self.prewarm_timeout = 3.0  # seconds per provider
+        
         # Enhanced intelligent routing
         self.intelligent_router = IntelligentRouter()
         
@@ -376,8 +381,8 @@ class EnhancedModelBridge:
         # Performance tracking
         self.performance_stats: Dict[str, Dict[str, Any]] = {}
         
-        # Initialize configuration
-        self.config = Config()
+        # Shared configuration, loaded once at import time
+        self.config = app_config
         
         # All available provider classes (only those with dependencies installed)
         self.provider_classes = {
@@ -483,6 +488,7 @@ class EnhancedModelBridge:
             if any(initialization_results):
                 self._initialized = True
                 logger.info(f"Enhanced Model Bridge initialized with {len(self.providers)} providers")
+                await self._prewarm()
                 await self._log_available_models()
                 return True
             else:
@@ -493,6 +499,17 @@ class EnhancedModelBridge:
             logger.error(f"Failed to initialize Enhanced Model Bridge: {str(e)}")
             return False
     
+    async def _prewarm(self):
+        """Open provider connections up front so the first request skips the handshake"""
+        
+        async def _warm(provider_name: str, provider: BaseModelProvider):
+            try:
+                await asyncio.wait_for(provider.warm_up(), timeout=self.prewarm_timeout)
+            except Exception as e:
+                logger.debug(f"Connection pre-warm failed for {provider_name}: {str(e)}")
+        
+        await asyncio.gather(*(_warm(name, provider) for name, provider in self.providers.items()))
+    
     def _setup_dynamic_model_aliases(self, aliases_config: Dict[str, List[Dict[str, Any]]]):
         """Setup model aliases based on available providers"""
         self.model_aliases = {}
@@ -1318,18 +1335,23 @@ class EnhancedModelBridge:
         health_results = {}
         overall_healthy = False
         
-        for provider_name, provider in self.providers.items():
-            try:
-                health_result = await provider.health_check()
-                health_results[provider_name] = health_result
-                if health_result.get("status") == "healthy":
-                    overall_healthy = True
-            except Exception as e:
-                health_results[provider_name] = {
-                    "status": "unhealthy",
-                    "error": str(e),
-                    "provider": provider_name
-                }
+        # Probe all providers concurrently so total latency is bounded by the
+        # slowest provider rather than the sum of all of them
+        semaphore = asyncio.Semaphore(self.health_check_concurrency)
+        
+        async def _bounded_check(provider_name: str, provider: BaseModelProvider) -> Dict[str, Any]:
+            async with semaphore:
+                return await self._check_provider_health(provider_name, provider)
+        
+        provider_items = list(self.providers.items())
+        results = await asyncio.gather(
+            *(_bounded_check(name, provider) for name, provider in provider_items)
+        )
+        
+        for (provider_name, _), health_result in zip(provider_items, results):
+            health_results[provider_name] = health_result
+            if health_result.get("status") == "healthy":
+                overall_healthy = True
         
         return {
             "status": "healthy" if overall_healthy else "unhealthy",
@@ -1343,6 +1365,23 @@ class EnhancedModelBridge:
             }
         }
     
+    async def _check_provider_health(self, provider_name: str, provider: BaseModelProvider) -> Dict[str, Any]:
+        """Check health of a single provider with a per-probe timeout"""
+        try:
+            return await asyncio.wait_for(provider.health_check(), timeout=self.health_check_timeout)
+        except asyncio.TimeoutError:
+            return {
+                "status": "unhealthy",
+                "error": f"Health check timed out after {self.health_check_timeout}s",
+                "provider": provider_name
+            }
+        except Exception as e:
+            return {
+                "status": "unhealthy",
+                "error": str(e),
+                "provider": provider_name
+            }
+    
     def get_stats(self) -> Dict[str, Any]:
         """Get comprehensive gateway statistics"""
         total_models = sum(len(provider.get_available_models()) for provider in self.providers.values())
@@ -28,6 +28,9 @@ class MonitoringService:
         """Collect current system health metrics"""
         
         try:
+            # Read the clock once and share it across the whole collection pass
+            now = datetime.utcnow()
+            
             # Get system metrics
             cpu_usage = psutil.cpu_percent(interval=1)
             memory = psutil.virtual_memory()
@@ -37,7 +40,7 @@ class MonitoringService:
             network_latency = 50.0  # ms - would be measured in production
             
             # Calculate response time (average from recent requests)
-            response_time = await self._get_average_response_time(db)
+            response_time = await self._get_average_response_time(db, now)
             
             # Determine status
             status = self._determine_health_status(cpu_usage, memory.percent, disk.percent)
@@ -55,13 +58,13 @@ class MonitoringService:
                 "status": status,
                 "uptime_seconds": uptime_seconds,
                 "active_connections": await self._get_active_connections(db),
-                "error_rate": await self._get_error_rate(db),
-                "throughput": await self._get_throughput(db),
+                "error_rate": await self._get_error_rate(db, now),
+                "throughput": await self._get_throughput(db, now),
                 "organization_id": organization_id
             }
             
             # Save to database
-            health_record = SystemHealth(**health_data)
+            health_record = SystemHealth(**health_data, recorded_at=now)
             db.add(health_record)
             await db.commit()
             
@@ -77,11 +80,11 @@ class MonitoringService:
                 "error": str(e)
             }
     
-    async def _get_average_response_time(self, db: AsyncSession) -> float:
+    async def _get_average_response_time(self, db: AsyncSession, now: Optional[datetime] = None) -> float:
         """Get average response time from recent requests"""
         try:
             # Get recent performance metrics
-            recent_time = datetime.utcnow() - timedelta(minutes=5)
+            recent_time = (now or datetime.utcnow()) - timedelta(minutes=5)
             result = await db.execute(
                 select(PerformanceMetric)
                 .where(
@@ -110,11 +113,11 @@ class MonitoringService:
             print(f"Error getting active connections: {e}")
             return 0
     
-    async def _get_error_rate(self, db: AsyncSession) -> float:
+    async def _get_error_rate(self, db: AsyncSession, now: Optional[datetime] = None) -> float:
         """Get current error rate"""
         try:
             # Calculate error rate from recent requests
-            recent_time = datetime.utcnow() - timedelta(minutes=5)
+            recent_time = (now or datetime.utcnow()) - timedelta(minutes=5)
             result = await db.execute(
                 select(PerformanceMetric)
                 .where(
@@ -135,11 +138,11 @@ class MonitoringService:
             print(f"Error getting error rate: {e}")
             return 0.0
     
-    async def _get_throughput(self, db: AsyncSession) -> float:
+    async def _get_throughput(self, db: AsyncSession, now: Optional[datetime] = None) -> float:
         """Get current requests per second"""
         try:
             # Calculate throughput from recent requests
-            recent_time = datetime.utcnow() - timedelta(minutes=1)
+            recent_time = (now or datetime.utcnow()) - timedelta(minutes=1)
             result = await db.execute(
                 select(PerformanceMetric)
                 .where(
@@ -146,6 +146,16 @@ class BaseModelProvider(ABC):
     
     # Optional methods that providers can override
     
+    async def warm_up(self) -> None:
+        """
+        Open a connection to the provider ahead of the first real request
+        
+        Called once after initialization so the first generation does not pay
+        for the TCP/TLS handshake. Providers whose initialize() already talks
+        to the API are warm by then and can keep this no-op.
+        """
+        pass
+    
     def supports_capability(self, model_id: str, capability: ModelCapability) -> bool:
         """Check if a model supports a specific capability"""
         if model_id in self._models_metadata:
@@ -280,6 +280,11 @@ Important: Respond ONLY with valid JSON, no additional text or explanations.
         """Get list of available Hugging Face models"""
         return list(self._models_metadata.values())
     
+    async def warm_up(self) -> None:
+        """Prime the HTTP connection pool, since initialize() makes no request"""
+        if self.client:
+            await self.client.head("/")
+    
     async def health_check(self) -> Dict[str, Any]:
         """Check Hugging Face provider health"""
         try:
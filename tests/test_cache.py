@@ -0,0 +1,267 @@
+"""
+Unit tests for the Redis response cache
+"""
+from unittest.mock import patch
+
+import orjson
+import pytest
+
+from utils.cache import (
+    CACHE_COMPRESSION_MIN_BYTES,
+    LOCAL_CACHE_TTL,
+    ZSTD_AVAILABLE,
+    ZSTD_MAGIC,
+    RedisCache,
+)
+
+ROUTE_PARAMS = {"max_tokens": 100, "temperature": 0.7, "task_type": "chat", "complexity": "low"}
+
+
+class _FakePipeline:
+    """Records commands and runs them against the fake client on execute"""
+
+    def __init__(self, client):
+        self.client = client
+        self.commands = []
+
+    def __getattr__(self, name):
+        def command(*args):
+            self.commands.append((name, args))
+            return self
+        return command
+
+    async def execute(self):
+        return [await getattr(self.client, name)(*args) for name, args in self.commands]
+
+
+class _FakeRedis:
+    """In-memory stand-in for the subset of redis.asyncio.Redis the cache uses"""
+
+    def __init__(self):
+        self.values = {}
+        self.sets = {}
+
+    def pipeline(self, transaction=True):
+        return _FakePipeline(self)
+
+    async def get(self, key):
+        return self.values.get(key)
+
+    async def setex(self, key, ttl, value):
+        self.values[key] = value
+        return True
+
+    async def sadd(self, key, *members):
+        self.sets.setdefault(key, set()).update(member.encode() for member in members)
+        return len(members)
+
+    async def expire(self, key, ttl):
+        return True
+
+    async def smembers(self, key):
+        return set(self.sets.get(key, ()))
+
+    async def delete(self, *keys):
+        removed = 0
+        for key in keys:
+            removed += self.values.pop(key, None) is not None
+            removed += self.sets.pop(key, None) is not None
+        return removed
+
+    async def unlink(self, *keys):
+        return await self.delete(*keys)
+
+    async def close(self):
+        pass
+
+
+class TestCacheEncoding:
+    """Test cache entry serialization and compression"""
+
+    @pytest.fixture
+    def cache(self):
+        """Cache instance; encoding never talks to Redis"""
+        return RedisCache()
+
+    @pytest.fixture
+    def small_entry(self):
+        """Entry that stays below the compression threshold"""
+        return {"content": "hi", "provider_name": "openai", "cost": 0.001}
+
+    @pytest.fixture
+    def large_entry(self):
+        """Entry large enough to be compressed when zstandard is installed"""
+        return {
+            "content": "The quick brown fox jumps over the lazy dog. " * 50,
+            "provider_name": "anthropic",
+            "model_id": "claude-3-haiku",
+            "usage": {"input_tokens": 120, "output_tokens": 480},
+            "metadata": {"cached": True, "scores": [0.1, 0.2, 0.3]},
+        }
+
+    def test_small_entry_round_trip(self, cache, small_entry):
+        """Test small entries are stored as plain orjson"""
+        raw = cache._encode(small_entry)
+
+        assert raw == orjson.dumps(small_entry)
+        assert cache._decode(raw) == small_entry
+
+    def test_large_entry_round_trip(self, cache, large_entry):
+        """Test large entries survive encoding and decoding"""
+        raw = cache._encode(large_entry)
+
+        assert cache._decode(raw) == large_entry
+
+    @pytest.mark.skipif(not ZSTD_AVAILABLE, reason="zstandard not installed")
+    def test_large_entry_is_compressed(self, cache, large_entry):
+        """Test entries over the threshold are zstd-compressed and marked"""
+        payload = orjson.dumps(large_entry)
+        assert len(payload) >= CACHE_COMPRESSION_MIN_BYTES
+
+        raw = cache._encode(large_entry)
+
+        assert raw.startswith(ZSTD_MAGIC)
+        assert len(raw) < len(payload)
+
+    def test_decodes_uncompressed_entries(self, cache, large_entry):
+        """Test plain orjson values written before compression still decode"""
+        assert cache._decode(orjson.dumps(large_entry)) == large_entry
+
+
+class TestCacheKeys:
+    """Test cache key generation"""
+
+    @pytest.fixture
+    def cache(self):
+        """Cache instance; key generation never talks to Redis"""
+        return RedisCache()
+
+    def test_fast_path_matches_generic_path(self, cache):
+        """Test the /generate fast path hashes the same fields as the generic path"""
+        fast_key = cache._generate_cache_key("Hello", "gpt-4", "org-1", **ROUTE_PARAMS)
+        with patch("utils.cache.ROUTE_CACHE_PARAMS", frozenset()):
+            generic_key = cache._generate_cache_key("Hello", "gpt-4", "org-1", **ROUTE_PARAMS)
+
+        assert fast_key == generic_key
+
+    def test_parameter_order_does_not_matter(self, cache):
+        """Test keys are independent of keyword argument order"""
+        params = {**ROUTE_PARAMS, "routing_strategy": "cost"}
+        reordered = dict(reversed(list(params.items())))
+
+        assert cache._generate_cache_key("Hello", "gpt-4", **params) == \
+            cache._generate_cache_key("Hello", "gpt-4", **reordered)
+
+    def test_dict_parameters_are_canonicalised(self, cache):
+        """Test equal schemas with different key order give the same key"""
+        schema = {"type": "object", "properties": {"name": {"type": "string"}, "age": {"type": "integer"}}}
+        reordered = {"properties": {"age": {"type": "integer"}, "name": {"type": "string"}}, "type": "object"}
+        changed = {"type": "object", "properties": {"name": {"type": "string"}}}
+
+        key = cache._generate_cache_key("Hello", "gpt-4", **ROUTE_PARAMS, response_schema=schema)
+
+        assert key == cache._generate_cache_key("Hello", "gpt-4", **ROUTE_PARAMS, response_schema=reordered)
+        assert key != cache._generate_cache_key("Hello", "gpt-4", **ROUTE_PARAMS, response_schema=changed)
+
+    def test_parameters_change_the_key(self, cache):
+        """Test different prompts, models or parameters give different keys"""
+        key = cache._generate_cache_key("Hello", "gpt-4", **ROUTE_PARAMS)
+
+        assert key != cache._generate_cache_key("Hello!", "gpt-4", **ROUTE_PARAMS)
+        assert key != cache._generate_cache_key("Hello", "gpt-4o", **ROUTE_PARAMS)
+        assert key != cache._generate_cache_key("Hello", "gpt-4", **{**ROUTE_PARAMS, "temperature": 0.8})
+
+    def test_organization_prefix(self, cache):
+        """Test keys are scoped by organization"""
+        org_key = cache._generate_cache_key("Hello", "gpt-4", "org-1", **ROUTE_PARAMS)
+        other_key = cache._generate_cache_key("Hello", "gpt-4", "org-2", **ROUTE_PARAMS)
+        global_key = cache._generate_cache_key("Hello", "gpt-4", **ROUTE_PARAMS)
+
+        assert org_key.startswith("llm_cache:org-1:")
+        assert other_key.startswith("llm_cache:org-2:")
+        assert global_key.count(":") == 1
+        assert org_key.rsplit(":", 1)[1] == other_key.rsplit(":", 1)[1] == global_key.split(":", 1)[1]
+
+
+class TestLocalCache:
+    """Test the in-process LRU tier"""
+
+    @pytest.fixture
+    def cache(self):
+        """Cache instance with an empty local tier"""
+        return RedisCache()
+
+    def test_entries_expire(self, cache):
+        """Test entries are dropped once their TTL has passed"""
+        with patch("utils.cache.time.monotonic", return_value=1000.0):
+            cache._local_put("key", {"content": "hi"}, ttl=10)
+            assert cache._local_get("key") == {"content": "hi"}
+
+        with patch("utils.cache.time.monotonic", return_value=1010.5):
+            assert cache._local_get("key") is None
+
+        assert "key" not in cache._local
+
+    def test_ttl_is_capped(self, cache):
+        """Test local entries never outlive LOCAL_CACHE_TTL"""
+        with patch("utils.cache.time.monotonic", return_value=1000.0):
+            cache._local_put("key", {"content": "hi"}, ttl=LOCAL_CACHE_TTL * 10)
+
+        with patch("utils.cache.time.monotonic", return_value=1000.0 + LOCAL_CACHE_TTL + 1):
+            assert cache._local_get("key") is None
+
+    def test_evicts_least_recently_used(self, cache):
+        """Test the oldest unused entry is evicted at capacity"""
+        with patch("utils.cache.LOCAL_CACHE_MAX_ENTRIES", 3):
+            for key in ("a", "b", "c"):
+                cache._local_put(key, {"content": key})
+            # Reading "a" makes "b" the least recently used
+            assert cache._local_get("a") == {"content": "a"}
+            cache._local_put("d", {"content": "d"})
+
+        assert list(cache._local) == ["c", "a", "d"]
+        assert cache._local_get("b") is None
+
+
+class TestClearUserCache:
+    """Test clearing an organization's cache"""
+
+    @pytest.fixture
+    async def cache(self):
+        """Cache backed by an in-memory Redis stand-in"""
+        cache = RedisCache()
+        cache.redis_client = _FakeRedis()
+        yield cache
+        await cache.close()
+
+    async def test_clears_only_indexed_keys(self, cache):
+        """Test only the keys in the organization's index set are removed"""
+        redis = cache.redis_client
+        await cache.set_many(
+            [("one", "gpt-4", {"content": "1"}, ROUTE_PARAMS), ("two", "gpt-4", {"content": "2"}, ROUTE_PARAMS)],
+            organization_id="org-1"
+        )
+        await cache.set_many([("one", "gpt-4", {"content": "1"}, ROUTE_PARAMS)], organization_id="org-2")
+        # Same prefix, but never indexed for org-1
+        redis.values["llm_cache:org-1:unindexed"] = b"{}"
+        org_1_keys = {key.decode() for key in redis.sets["llm_cache_index:org:org-1"]}
+
+        removed = await cache.clear_user_cache("org-1")
+
+        assert removed == 2
+        assert not org_1_keys & redis.values.keys()
+        assert not org_1_keys & cache._local.keys()
+        assert "llm_cache_index:org:org-1" not in redis.sets
+        assert "llm_cache:org-1:unindexed" in redis.values
+        assert len(redis.sets["llm_cache_index:org:org-2"]) == 1
+        assert await cache.get("one", "gpt-4", "org-2", **ROUTE_PARAMS) is not None
+
+    async def test_clears_queued_writes(self, cache):
+        """Test writes still queued for the background writer are cleared too"""
+        await cache.set("Hello", "gpt-4", {"content": "hi"}, organization_id="org-1", **ROUTE_PARAMS)
+
+        assert await cache.clear_user_cache("org-1") == 1
+        await cache.close()
+
+        assert cache.redis_client.values == {}
+        assert cache.redis_client.sets == {}
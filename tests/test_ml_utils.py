@@ -0,0 +1,155 @@
+"""
+Unit tests for the predictive routing ML utilities
+"""
+from datetime import datetime
+from unittest.mock import patch
+
+import numpy as np
+import pytest
+
+from utils.ml_utils import PerformancePredictor, SimpleLinearRegression
+
+FIXED_NOW = datetime(2024, 5, 15, 14, 30)
+
+
+class _FixedDatetime(datetime):
+    """datetime whose utcnow() is pinned, so time features are reproducible"""
+
+    @classmethod
+    def utcnow(cls):
+        return FIXED_NOW
+
+
+class TestSimpleLinearRegression:
+    """Test the closed-form regression fit"""
+
+    @pytest.fixture
+    def rng(self):
+        """Seeded random generator"""
+        return np.random.default_rng(0)
+
+    def test_matches_least_squares(self, rng):
+        """Test the fit agrees with an unregularized least-squares solve"""
+        X = rng.normal(size=(200, 10)) * rng.uniform(0.1, 50.0, size=10)
+        y = X @ rng.normal(size=10) + 3.0 + rng.normal(scale=0.1, size=200)
+
+        model = SimpleLinearRegression()
+        model.train(X, y)
+
+        X_aug = np.hstack([X, np.ones((len(X), 1))])
+        solution, *_ = np.linalg.lstsq(X_aug, y, rcond=None)
+        expected = X_aug @ solution
+
+        assert model.is_trained
+        np.testing.assert_allclose(model.predict(X), expected, rtol=1e-4, atol=1e-4)
+
+    def test_recovers_exact_linear_relationship(self, rng):
+        """Test noise-free targets are reproduced"""
+        X = rng.uniform(0.0, 10.0, size=(50, 10))
+        y = X @ np.arange(1.0, 11.0) - 2.0
+
+        model = SimpleLinearRegression()
+        model.train(X, y)
+
+        np.testing.assert_allclose(model.predict(X), y, rtol=1e-5, atol=1e-4)
+
+    def test_constant_feature_columns(self, rng):
+        """Test constant columns get no weight instead of making the fit blow up"""
+        X = rng.uniform(0.0, 1.0, size=(40, 10))
+        # Provider columns are the same for every training row
+        X[:, 5:] = [2.0, 0.95, 0.05, 0.4, 0.5]
+        y = 4.0 * X[:, 0] + 1.0
+
+        model = SimpleLinearRegression()
+        model.train(X, y)
+
+        assert np.all(np.isfinite(model.weights))
+        np.testing.assert_allclose(model.weights[5:], 0.0, atol=1e-6)
+        np.testing.assert_allclose(model.predict(X), y, rtol=1e-5, atol=1e-4)
+
+    def test_untrained_model_predicts_zeros(self):
+        """Test an untrained model returns zeros"""
+        model = SimpleLinearRegression()
+
+        np.testing.assert_array_equal(model.predict(np.ones((3, 10))), np.zeros(3))
+
+
+class TestPerformancePredictor:
+    """Test batched and per-provider performance prediction"""
+
+    PROVIDERS = ["openai", "anthropic"]
+
+    @pytest.fixture(autouse=True)
+    def fixed_time(self):
+        """Pin the clock used for time-of-day and day-of-week features"""
+        with patch("utils.ml_utils.datetime", _FixedDatetime):
+            yield
+
+    @pytest.fixture
+    def predictor(self):
+        """Predictor with trained models for two providers"""
+        rng = np.random.default_rng(1)
+        predictor = PerformancePredictor()
+        task_types = ["chat", "code", "analysis"]
+
+        for offset, provider in enumerate(self.PROVIDERS):
+            for i in range(30):
+                prompt = "explain " * int(rng.integers(1, 200)) + "complex detailed " * (i % 3)
+                request_data = {"prompt": prompt, "task_type": task_types[i % 3]}
+                response_time = 1.0 + offset + len(prompt) / 500.0 + float(rng.normal(scale=0.05))
+                predictor.add_training_data(provider, request_data, response_time, bool(i % 5))
+
+        assert set(predictor._provider_index) == set(self.PROVIDERS)
+        return predictor
+
+    @staticmethod
+    def _assert_batch_matches_single(predictor, provider_names, request_data):
+        batch = predictor.predict_performance_batch(provider_names, request_data)
+
+        assert list(batch) == provider_names
+        for name in provider_names:
+            single = predictor.predict_performance(name, request_data)
+            assert batch[name].predicted_response_time == pytest.approx(
+                single.predicted_response_time, rel=1e-5, abs=1e-6
+            )
+            assert batch[name].predicted_success_rate == pytest.approx(
+                single.predicted_success_rate, rel=1e-5, abs=1e-6
+            )
+            assert batch[name].confidence_score == single.confidence_score
+            assert dict(batch[name].feature_importance) == pytest.approx(dict(single.feature_importance))
+
+    def test_batch_matches_per_provider(self, predictor):
+        """Test batched predictions equal predict_performance for each provider"""
+        request_data = {"prompt": "Please analyze this comprehensive report", "task_type": "analysis"}
+
+        self._assert_batch_matches_single(predictor, self.PROVIDERS, request_data)
+
+    def test_batch_with_untrained_provider(self, predictor):
+        """Test providers without models fall back to per-provider defaults"""
+        request_data = {"prompt": "hello", "task_type": "chat"}
+        provider_names = ["anthropic", "mistral", "openai"]
+
+        self._assert_batch_matches_single(predictor, provider_names, request_data)
+        batch = predictor.predict_performance_batch(provider_names, request_data)
+        assert batch["mistral"].confidence_score == 0.5
+
+    def test_batch_matches_after_save_and_load(self, predictor, tmp_path):
+        """Test saved and reloaded models give the same batched predictions"""
+        request_data = {"prompt": "write some code " * 40, "task_type": "code"}
+        before = predictor.predict_performance_batch(self.PROVIDERS, request_data)
+
+        filepath = tmp_path / "models.json"
+        predictor.save_models(str(filepath))
+        loaded = PerformancePredictor()
+        loaded.load_models(str(filepath))
+
+        assert set(loaded._provider_index) == set(self.PROVIDERS)
+        self._assert_batch_matches_single(loaded, self.PROVIDERS, request_data)
+        after = loaded.predict_performance_batch(self.PROVIDERS, request_data)
+        for name in self.PROVIDERS:
+            assert after[name].predicted_response_time == pytest.approx(
+                before[name].predicted_response_time, rel=1e-5
+            )
+            assert after[name].predicted_success_rate == pytest.approx(
+                before[name].predicted_success_rate, rel=1e-5, abs=1e-6
+            )
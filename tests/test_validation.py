@@ -0,0 +1,64 @@
+"""
+Unit tests for input validation utilities
+"""
+import random
+import re
+import string
+from typing import List
+
+import pytest
+
+from utils.validation import validate_password_strength
+
+
+def _regex_password_errors(password: str) -> List[str]:
+    """Reference implementation: the original one-regex-per-class checks"""
+    errors = []
+    if len(password) < 8:
+        errors.append("Password must be at least 8 characters long")
+    if not re.search(r'[A-Z]', password):
+        errors.append("Password must contain at least one uppercase letter")
+    if not re.search(r'[a-z]', password):
+        errors.append("Password must contain at least one lowercase letter")
+    if not re.search(r'\d', password):
+        errors.append("Password must contain at least one digit")
+    if not re.search(r'[!@#$%^&*(),.?":{}|<>]', password):
+        errors.append("Password must contain at least one special character")
+    return errors
+
+
+class TestPasswordStrength:
+    """Test password strength validation"""
+
+    # ASCII classes plus characters the regexes treat specially: Unicode
+    # digits match \d (superscripts do not), accented and non-Latin letters
+    # match neither case class
+    ALPHABET = (
+        string.ascii_letters + string.digits + string.punctuation + " \t"
+        + "٣५０²" + "ÄéßΩж" + "€£_-~[]"
+    )
+
+    @pytest.mark.parametrize("password,expected", [
+        ("Str0ng!Pass", []),
+        ("short1!", [
+            "Password must be at least 8 characters long",
+            "Password must contain at least one uppercase letter",
+        ]),
+        ("alllowercase", [
+            "Password must contain at least one uppercase letter",
+            "Password must contain at least one digit",
+            "Password must contain at least one special character",
+        ]),
+        ("", _regex_password_errors("")),
+    ])
+    def test_known_passwords(self, password, expected):
+        """Test error lists for representative passwords"""
+        assert validate_password_strength(password) == expected
+
+    def test_matches_regex_checks(self):
+        """Test the single-pass scan agrees with the per-class regexes"""
+        rng = random.Random(0)
+        for _ in range(5000):
+            length = rng.randint(0, 16)
+            password = "".join(rng.choice(self.ALPHABET) for _ in range(length))
+            assert validate_password_strength(password) == _regex_password_errors(password), password
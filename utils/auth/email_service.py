@@ -2,17 +2,182 @@
 Email service for authentication
 """
 import os
+import asyncio
 import smtplib
 import logging
+import threading
+from string import Template
+from email import message_from_bytes, policy as email_policy
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from typing import Optional
 from dotenv import load_dotenv
 
+try:
+    import aiosmtplib
+    AIOSMTPLIB_AVAILABLE = True
+except ImportError:
+    aiosmtplib = None
+    AIOSMTPLIB_AVAILABLE = False
+
 load_dotenv()
 
 logger = logging.getLogger("email_service")
 
+# Recycle the SMTP session after this many messages
+SMTP_MAX_MESSAGES_PER_CONNECTION = 1000
+
+# Async sender: number of pooled sessions and per-session recycle limit
+SMTP_POOL_SIZE = int(os.getenv('SMTP_POOL_SIZE', '5'))
+ASYNC_SMTP_MAX_MESSAGES_PER_CONNECTION = 100
+
+# Email templates, parsed once at import time. string.Template is used so the
+# CSS braces don't need escaping.
+_RESET_SUBJECT = "Reset Your Password - Model Bridge"
+_RESET_TEMPLATE = Template("""
+<!DOCTYPE html>
+<html>
+<head>
+    <meta charset="utf-8">
+    <title>Password Reset</title>
+    <style>
+        body {
+            font-family: Arial, sans-serif;
+            line-height: 1.6;
+            color: #333;
+            max-width: 600px;
+            margin: 0 auto;
+            padding: 20px;
+        }
+        .header {
+            background: linear-gradient(135deg, #000000 0%, #14213d 100%);
+            color: white;
+            padding: 30px;
+            text-align: center;
+            border-radius: 10px 10px 0 0;
+        }
+        .content {
+            background: #f8f9fa;
+            padding: 30px;
+            border-radius: 0 0 10px 10px;
+        }
+        .button {
+            display: inline-block;
+            background: linear-gradient(135deg, #000000 0%, #14213d 100%);
+            color: white;
+            padding: 12px 30px;
+            text-decoration: none;
+            border-radius: 5px;
+            margin: 20px 0;
+        }
+        .footer {
+            text-align: center;
+            color: #666;
+            margin-top: 30px;
+            font-size: 14px;
+        }
+    </style>
+</head>
+<body>
+    <div class="header">
+        <h1>Model Bridge</h1>
+        <h2>Password Reset Request</h2>
+    </div>
+    <div class="content">
+        <p>Hello,</p>
+        <p>We received a request to reset your password for your Model Bridge account.</p>
+        <p>Click the button below to reset your password:</p>
+        <p style="text-align: center;">
+            <a href="$reset_url" class="button">Reset Password</a>
+        </p>
+        <p>If the button doesn't work, copy and paste this link into your browser:</p>
+        <p style="word-break: break-all; color: #666;">$reset_url</p>
+        <p><strong>This link will expire in 1 hour.</strong></p>
+        <p>If you didn't request this password reset, please ignore this email.</p>
+    </div>
+    <div class="footer">
+        <p>&copy; 2024 Model Bridge. All rights reserved.</p>
+    </div>
+</body>
+</html>
+""")
+
+_VERIFICATION_SUBJECT = "Verify Your Email - Model Bridge"
+_VERIFICATION_TEMPLATE = Template("""
+<!DOCTYPE html>
+<html>
+<head>
+    <meta charset="utf-8">
+    <title>Email Verification</title>
+    <style>
+        body {
+            font-family: Arial, sans-serif;
+            line-height: 1.6;
+            color: #333;
+            max-width: 600px;
+            margin: 0 auto;
+            padding: 20px;
+        }
+        .header {
+            background: linear-gradient(135deg, #000000 0%, #14213d 100%);
+            color: white;
+            padding: 30px;
+            text-align: center;
+            border-radius: 10px 10px 0 0;
+        }
+        .content {
+            background: #f8f9fa;
+            padding: 30px;
+            border-radius: 0 0 10px 10px;
+        }
+        .button {
+            display: inline-block;
+            background: linear-gradient(135deg, #000000 0%, #14213d 100%);
+            color: white;
+            padding: 12px 30px;
+            text-decoration: none;
+            border-radius: 5px;
+            margin: 20px 0;
+        }
+        .footer {
+            text-align: center;
+            color: #666;
+            margin-top: 30px;
+            font-size: 14px;
+        }
+    </style>
+</head>
+<body>
+    <div class="header">
+        <h1>Model Bridge</h1>
+        <h2>Welcome! Please verify your email</h2>
+    </div>
+    <div class="content">
+        <p>Hello,</p>
+        <p>Thank you for signing up for Model Bridge! To complete your registration, please verify your email address.</p>
+        <p>Click the button below to verify your email:</p>
+        <p style="text-align: center;">
+            <a href="$verification_url" class="button">Verify Email</a>
+        </p>
+        <p>If the button doesn't work, copy and paste this link into your browser:</p>
+        <p style="word-break: break-all; color: #666;">$verification_url</p>
+        <p><strong>This link will expire in 24 hours.</strong></p>
+        <p>If you didn't create an account, please ignore this email.</p>
+    </div>
+    <div class="footer">
+        <p>&copy; 2024 Model Bridge. All rights reserved.</p>
+    </div>
+</body>
+</html>
+""")
+
+# Pre-rendered messages carry these in place of the per-recipient values.
+# The templates are kept ASCII-only so MIMEText sends them as 7bit text and
+# the placeholders survive serialization unencoded.
+_TO_PLACEHOLDER = "__TO_EMAIL__"
+_URL_PLACEHOLDER = "__ACTION_URL__"
+
+
 class EmailService:
     def __init__(self):
         self.smtp_server = os.getenv('SMTP_SERVER', 'smtp.gmail.com')
@@ -22,185 +187,267 @@ class EmailService:
         self.from_email = os.getenv('FROM_EMAIL', self.smtp_username)
         self.app_url = os.getenv('APP_URL', 'http://localhost:3000')
         
+        # Persistent SMTP session, reused across sends to skip STARTTLS + LOGIN
+        self._smtp: Optional[smtplib.SMTP] = None
+        self._smtp_messages_sent = 0
+        self._smtp_lock = threading.Lock()
+        
+        # Wire-format messages rendered once; sends only splice in recipient and URL
+        self._reset_message = self._build_message(
+            _TO_PLACEHOLDER, _RESET_SUBJECT, _RESET_TEMPLATE.substitute(reset_url=_URL_PLACEHOLDER)
+        )
+        self._verification_message = self._build_message(
+            _TO_PLACEHOLDER,
+            _VERIFICATION_SUBJECT,
+            _VERIFICATION_TEMPLATE.substitute(verification_url=_URL_PLACEHOLDER)
+        )
+    
+    def _is_alive(self) -> bool:
+        """Check whether the current SMTP session is still usable"""
+        try:
+            return self._smtp.noop()[0] == 250
+        except Exception:
+            return False
+    
+    def _get_connection(self) -> smtplib.SMTP:
+        """Return a live, authenticated SMTP session, reconnecting if needed"""
+        if self._smtp is not None:
+            if self._smtp_messages_sent < SMTP_MAX_MESSAGES_PER_CONNECTION and self._is_alive():
+                return self._smtp
+            self._disconnect()
+        
+        server = smtplib.SMTP(self.smtp_server, self.smtp_port)
+        server.starttls()
+        server.login(self.smtp_username, self.smtp_password)
+        
+        self._smtp = server
+        self._smtp_messages_sent = 0
+        return server
+    
+    def _disconnect(self):
+        """Drop the current SMTP session"""
+        if self._smtp is None:
+            return
+        try:
+            self._smtp.quit()
+        except Exception:
+            pass
+        self._smtp = None
+        self._smtp_messages_sent = 0
+    
+    def close(self):
+        """Close the persistent SMTP session"""
+        with self._smtp_lock:
+            self._disconnect()
+        
     def send_email(self, to_email: str, subject: str, html_content: str) -> bool:
         """Send an email"""
+        return self.send_message(to_email, subject, self._build_message(to_email, subject, html_content))
+    
+    def send_message(self, to_email: str, subject: str, message: bytes) -> bool:
+        """Send an already serialized MIME message"""
+        if "\r" in to_email or "\n" in to_email:
+            # The address is spliced into raw headers, so refuse header injection
+            logger.error("Failed to send email: invalid recipient address")
+            return False
+        
         if not self.smtp_username or not self.smtp_password:
             # Development mode: log email instead of sending
             logger.info("📧 EMAIL SERVICE - DEVELOPMENT MODE")
             logger.info(f"TO: {to_email}")
             logger.info(f"SUBJECT: {subject}")
-            logger.info(f"HTML CONTENT: {html_content}")
+            logger.info(f"HTML CONTENT: {self._message_body(message)}")
             logger.info("✅ Email logged successfully (SMTP not configured)")
             return True
             
         try:
-            msg = MIMEMultipart('alternative')
-            msg['Subject'] = subject
-            msg['From'] = self.from_email
-            msg['To'] = to_email
-            
-            html_part = MIMEText(html_content, 'html')
-            msg.attach(html_part)
-            
-            server = smtplib.SMTP(self.smtp_server, self.smtp_port)
-            server.starttls()
-            server.login(self.smtp_username, self.smtp_password)
-            server.send_message(msg)
-            server.quit()
+            with self._smtp_lock:
+                try:
+                    server = self._get_connection()
+                    server.sendmail(self.from_email, [to_email], message)
+                    self._smtp_messages_sent += 1
+                except Exception:
+                    # Don't reuse a session left in an unknown state
+                    self._disconnect()
+                    raise
             
             return True
         except Exception as e:
             logger.error(f"Failed to send email: {e}")
             return False
     
-    def send_password_reset_email(self, email: str, token: str) -> bool:
-        """Send password reset email"""
-        reset_url = f"{self.app_url}/reset-password?token={token}"
+    def _build_message(self, to_email: str, subject: str, html_content: str) -> bytes:
+        """Build the wire-format MIME message for an HTML email"""
+        msg = MIMEMultipart('alternative')
+        msg['Subject'] = subject
+        msg['From'] = self.from_email
+        msg['To'] = to_email
         
-        html_content = f"""
-        <!DOCTYPE html>
-        <html>
-        <head>
-            <meta charset="utf-8">
-            <title>Password Reset</title>
-            <style>
-                body {{
-                    font-family: Arial, sans-serif;
-                    line-height: 1.6;
-                    color: #333;
-                    max-width: 600px;
-                    margin: 0 auto;
-                    padding: 20px;
-                }}
-                .header {{
-                    background: linear-gradient(135deg, #000000 0%, #14213d 100%);
-                    color: white;
-                    padding: 30px;
-                    text-align: center;
-                    border-radius: 10px 10px 0 0;
-                }}
-                .content {{
-                    background: #f8f9fa;
-                    padding: 30px;
-                    border-radius: 0 0 10px 10px;
-                }}
-                .button {{
-                    display: inline-block;
-                    background: linear-gradient(135deg, #000000 0%, #14213d 100%);
-                    color: white;
-                    padding: 12px 30px;
-                    text-decoration: none;
-                    border-radius: 5px;
-                    margin: 20px 0;
-                }}
-                .footer {{
-                    text-align: center;
-                    color: #666;
-                    margin-top: 30px;
-                    font-size: 14px;
-                }}
-            </style>
-        </head>
-        <body>
-            <div class="header">
-                <h1>Model Bridge</h1>
-                <h2>Password Reset Request</h2>
-            </div>
-            <div class="content">
-                <p>Hello,</p>
-                <p>We received a request to reset your password for your Model Bridge account.</p>
-                <p>Click the button below to reset your password:</p>
-                <p style="text-align: center;">
-                    <a href="{reset_url}" class="button">Reset Password</a>
-                </p>
-                <p>If the button doesn't work, copy and paste this link into your browser:</p>
-                <p style="word-break: break-all; color: #666;">{reset_url}</p>
-                <p><strong>This link will expire in 1 hour.</strong></p>
-                <p>If you didn't request this password reset, please ignore this email.</p>
-            </div>
-            <div class="footer">
-                <p>© 2024 Model Bridge. All rights reserved.</p>
-            </div>
-        </body>
-        </html>
-        """
+        html_part = MIMEText(html_content, 'html')
+        msg.attach(html_part)
         
-        return self.send_email(email, "Reset Your Password - Model Bridge", html_content)
+        return msg.as_bytes(policy=msg.policy.clone(linesep="\r\n"))
+    
+    @staticmethod
+    def _message_body(message: bytes) -> str:
+        """Decode the HTML (or plain text) body of a serialized message, for logging"""
+        parsed = message_from_bytes(message, policy=email_policy.default)
+        body = parsed.get_body(preferencelist=('html', 'plain'))
+        return body.get_content() if body is not None else message.decode('utf-8', 'replace')
+    
+    @staticmethod
+    def _fill_message(template: bytes, to_email: str, url: str) -> bytes:
+        """Splice the recipient and action URL into a pre-rendered message"""
+        return (
+            template
+            .replace(_TO_PLACEHOLDER.encode(), to_email.encode())
+            .replace(_URL_PLACEHOLDER.encode(), url.encode())
+        )
+    
+    def _render_password_reset(self, email: str, token: str) -> bytes:
+        """Render the password reset message"""
+        reset_url = f"{self.app_url}/reset-password?token={token}"
+        return self._fill_message(self._reset_message, email, reset_url)
+    
+    def _render_verification(self, email: str, token: str) -> bytes:
+        """Render the email verification message"""
+        verification_url = f"{self.app_url}/verify-email?token={token}"
+        return self._fill_message(self._verification_message, email, verification_url)
+    
+    def send_password_reset_email(self, email: str, token: str) -> bool:
+        """Send password reset email"""
+        return self.send_message(email, _RESET_SUBJECT, self._render_password_reset(email, token))
     
     def send_verification_email(self, email: str, token: str) -> bool:
         """Send email verification"""
-        verification_url = f"{self.app_url}/verify-email?token={token}"
+        return self.send_message(email, _VERIFICATION_SUBJECT, self._render_verification(email, token))
+
+
+class AsyncEmailService:
+    """
+    Email sender for async request handlers
+    
+    Sends over a small pool of persistent, authenticated aiosmtplib sessions so
+    handlers never block the event loop on SMTP. Falls back to running the
+    synchronous service in a worker thread when aiosmtplib is not installed.
+    """
+    
+    def __init__(self, sync_service: EmailService, pool_size: int = SMTP_POOL_SIZE):
+        self.sync_service = sync_service
+        self.pool_size = pool_size
+        # Created lazily so the queue binds to the serving event loop
+        self._pool: Optional[asyncio.Queue] = None
+    
+    def _get_pool(self) -> asyncio.Queue:
+        """Get the session pool, creating it on first use"""
+        if self._pool is None:
+            self._pool = asyncio.Queue()
+            for _ in range(self.pool_size):
+                # (session, messages sent); sessions are opened on demand
+                self._pool.put_nowait((None, 0))
+        return self._pool
+    
+    async def _connect(self) -> "aiosmtplib.SMTP":
+        """Open and authenticate a new SMTP session"""
+        service = self.sync_service
+        conn = aiosmtplib.SMTP(hostname=service.smtp_server, port=service.smtp_port, start_tls=True)
+        await conn.connect()
+        try:
+            await conn.login(service.smtp_username, service.smtp_password)
+        except Exception:
+            # Don't leak the half-open connection
+            await self._quit(conn)
+            raise
+        return conn
+    
+    @staticmethod
+    async def _quit(conn: "aiosmtplib.SMTP"):
+        """Close a session, ignoring errors from already-dead connections"""
+        try:
+            await conn.quit()
+        except Exception:
+            # QUIT failed; still drop the transport
+            try:
+                conn.close()
+            except Exception:
+                pass
+    
+    async def send_email(self, to_email: str, subject: str, html_content: str) -> bool:
+        """Send an email"""
+        return await self.send_message(
+            to_email, subject, self.sync_service._build_message(to_email, subject, html_content)
+        )
+    
+    async def send_message(self, to_email: str, subject: str, message: bytes) -> bool:
+        """Send an already serialized MIME message"""
+        service = self.sync_service
+        if "\r" in to_email or "\n" in to_email:
+            # The address is spliced into raw headers, so refuse header injection
+            logger.error("Failed to send email: invalid recipient address")
+            return False
         
-        html_content = f"""
-        <!DOCTYPE html>
-        <html>
-        <head>
-            <meta charset="utf-8">
-            <title>Email Verification</title>
-            <style>
-                body {{
-                    font-family: Arial, sans-serif;
-                    line-height: 1.6;
-                    color: #333;
-                    max-width: 600px;
-                    margin: 0 auto;
-                    padding: 20px;
-                }}
-                .header {{
-                    background: linear-gradient(135deg, #000000 0%, #14213d 100%);
-                    color: white;
-                    padding: 30px;
-                    text-align: center;
-                    border-radius: 10px 10px 0 0;
-                }}
-                .content {{
-                    background: #f8f9fa;
-                    padding: 30px;
-                    border-radius: 0 0 10px 10px;
-                }}
-                .button {{
-                    display: inline-block;
-                    background: linear-gradient(135deg, #000000 0%, #14213d 100%);
-                    color: white;
-                    padding: 12px 30px;
-                    text-decoration: none;
-                    border-radius: 5px;
-                    margin: 20px 0;
-                }}
-                .footer {{
-                    text-align: center;
-                    color: #666;
-                    margin-top: 30px;
-                    font-size: 14px;
-                }}
-            </style>
-        </head>
-        <body>
-            <div class="header">
-                <h1>Model Bridge</h1>
-                <h2>Welcome! Please verify your email</h2>
-            </div>
-            <div class="content">
-                <p>Hello,</p>
-                <p>Thank you for signing up for Model Bridge! To complete your registration, please verify your email address.</p>
-                <p>Click the button below to verify your email:</p>
-                <p style="text-align: center;">
-                    <a href="{verification_url}" class="button">Verify Email</a>
-                </p>
-                <p>If the button doesn't work, copy and paste this link into your browser:</p>
-                <p style="word-break: break-all; color: #666;">{verification_url}</p>
-                <p><strong>This link will expire in 24 hours.</strong></p>
-                <p>If you didn't create an account, please ignore this email.</p>
-            </div>
-            <div class="footer">
-                <p>© 2024 Model Bridge. All rights reserved.</p>
-            </div>
-        </body>
-        </html>
-        """
+        if not service.smtp_username or not service.smtp_password:
+            # Development mode only logs the email, no I/O to offload
+            return service.send_message(to_email, subject, message)
         
-        return self.send_email(email, "Verify Your Email - Model Bridge", html_content)
+        if not AIOSMTPLIB_AVAILABLE:
+            return await asyncio.to_thread(service.send_message, to_email, subject, message)
+        
+        pool = self._get_pool()
+        conn, sent = await pool.get()
+        try:
+            if conn is not None and (not conn.is_connected or sent >= ASYNC_SMTP_MAX_MESSAGES_PER_CONNECTION):
+                await self._quit(conn)
+                conn = None
+            
+            if conn is not None:
+                try:
+                    await conn.sendmail(service.from_email, [to_email], message)
+                    sent += 1
+                    return True
+                except ConnectionError:
+                    # The server may have closed the idle session; retry once
+                    # on a fresh one below
+                    await self._quit(conn)
+                    conn = None
+            
+            conn, sent = await self._connect(), 0
+            await conn.sendmail(service.from_email, [to_email], message)
+            sent += 1
+            return True
+        except Exception as e:
+            logger.error(f"Failed to send email: {e}")
+            # Don't reuse a session left in an unknown state
+            if conn is not None:
+                await self._quit(conn)
+            conn, sent = None, 0
+            return False
+        finally:
+            pool.put_nowait((conn, sent))
+    
+    async def send_password_reset_email(self, email: str, token: str) -> bool:
+        """Send password reset email"""
+        return await self.send_message(
+            email, _RESET_SUBJECT, self.sync_service._render_password_reset(email, token)
+        )
+    
+    async def send_verification_email(self, email: str, token: str) -> bool:
+        """Send email verification"""
+        return await self.send_message(
+            email, _VERIFICATION_SUBJECT, self.sync_service._render_verification(email, token)
+        )
+    
+    async def close(self):
+        """Close all pooled SMTP sessions"""
+        if self._pool is None:
+            return
+        for _ in range(self.pool_size):
+            conn, _ = await self._pool.get()
+            if conn is not None:
+                await self._quit(conn)
+            self._pool.put_nowait((None, 0))
 
 
-# Global instance
-email_service = EmailService()
\ No newline at end of file
+# Global instances
+email_service = EmailService()
+async_email_service = AsyncEmailService(email_service)
\ No newline at end of file
@@ -2,33 +2,121 @@
 Redis caching utilities for LLM responses
 """
 import os
-import json
+import asyncio
+import logging
+import orjson
+import base64
 import hashlib
-import redis
-from typing import Optional, Dict, Any
+import time
+import redis.asyncio as aioredis
+from collections import OrderedDict
+from typing import Optional, Dict, Any, List, Tuple
 from datetime import datetime, timedelta
 
+try:
+    import zstandard as zstd
+    ZSTD_AVAILABLE = True
+except ImportError:
+    zstd = None
+    ZSTD_AVAILABLE = False
+
+logger = logging.getLogger("cache")
+
 # Redis configuration
 REDIS_HOST = os.getenv("REDIS_HOST", "localhost")
 REDIS_PORT = int(os.getenv("REDIS_PORT", "6379"))
 REDIS_DB = int(os.getenv("REDIS_DB", "0"))
 REDIS_PASSWORD = os.getenv("REDIS_PASSWORD")
+REDIS_MAX_CONNECTIONS = int(os.getenv("REDIS_MAX_CONNECTIONS", "50"))
 
 # Cache TTL settings
 DEFAULT_CACHE_TTL = int(os.getenv("CACHE_TTL_SECONDS", "3600"))  # 1 hour
 LONG_CACHE_TTL = int(os.getenv("LONG_CACHE_TTL_SECONDS", "86400"))  # 24 hours
 
+# In-process LRU in front of Redis for hot prompts
+LOCAL_CACHE_MAX_ENTRIES = int(os.getenv("LOCAL_CACHE_MAX_ENTRIES", "1024"))
+LOCAL_CACHE_TTL = int(os.getenv("LOCAL_CACHE_TTL_SECONDS", "60"))
+
+# Sampling parameters /generate passes to get/set; keys built from exactly
+# this set take a fixed-order fast path. /generate/advanced (routing_strategy)
+# and /generate/structured (response_schema) add a parameter and use the
+# generic sorted path instead.
+ROUTE_CACHE_PARAMS = frozenset({"max_tokens", "temperature", "task_type", "complexity"})
+
+# Value compression (zstd, when installed)
+CACHE_COMPRESSION_LEVEL = int(os.getenv("CACHE_COMPRESSION_LEVEL", "3"))
+CACHE_COMPRESSION_MIN_BYTES = int(os.getenv("CACHE_COMPRESSION_MIN_BYTES", "256"))
+# Prefix marking a zstd-compressed value; raw orjson values start with '{'
+ZSTD_MAGIC = b"\x01"
+
+# How long a health check result is reused before pinging Redis again
+HEALTH_CHECK_TTL = 1.0  # seconds
+
+# Background write-behind for cache.set
+WRITE_QUEUE_MAX_SIZE = int(os.getenv("CACHE_WRITE_QUEUE_MAX_SIZE", "10000"))
+WRITE_BATCH_SIZE = 100  # SETEXs sent per pipeline round-trip
+WRITE_FLUSH_INTERVAL = 0.01  # seconds to wait for a batch to fill
+WRITE_DRAIN_TIMEOUT = 5.0  # seconds to wait for queued writes before a delete or close
+
+# Bulk key operations
+DELETE_BATCH_SIZE = 500  # UNLINKs sent per pipeline round-trip
+
+# Shared by every RedisCache instance so sockets are capped process-wide
+connection_pool = aioredis.ConnectionPool(
+    host=REDIS_HOST,
+    port=REDIS_PORT,
+    db=REDIS_DB,
+    password=REDIS_PASSWORD,
+    max_connections=REDIS_MAX_CONNECTIONS,
+    # Values are orjson/zstd bytes, so skip decoding replies to str
+    decode_responses=False
+)
+
+def _frame(data: bytes) -> bytes:
+    """Length-prefix a cache key field so field boundaries are unambiguous"""
+    return len(data).to_bytes(8, "little") + data
+
+
+def _encode_param(value: Any) -> bytes:
+    """Encode a request parameter for hashing into a cache key"""
+    if isinstance(value, (dict, list, tuple)):
+        # Canonical encoding so e.g. equal response schemas with different
+        # key order hash the same
+        return orjson.dumps(value, option=orjson.OPT_SORT_KEYS)
+    return repr(value).encode()
+
+
+# ROUTE_CACHE_PARAMS in sorted order, with their framed names precomputed
+_ROUTE_PARAM_FIELDS = tuple((key, _frame(key.encode())) for key in sorted(ROUTE_CACHE_PARAMS))
+
+
 class RedisCache:
     """Redis cache manager for LLM responses"""
     
     def __init__(self):
-        self.redis_client = redis.Redis(
-            host=REDIS_HOST,
-            port=REDIS_PORT,
-            db=REDIS_DB,
-            password=REDIS_PASSWORD,
-            decode_responses=True
-        )
+        # Async client so Redis round-trips yield to the event loop
+        self.redis_client = aioredis.Redis(connection_pool=connection_pool)
+        
+        # Local LRU tier: cache_key -> (expires_at monotonic, response)
+        self._local: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self.local_hits = 0
+        self.local_misses = 0
+        
+        # Compression contexts are built once and reused for every value
+        if ZSTD_AVAILABLE:
+            self._cctx = zstd.ZstdCompressor(level=CACHE_COMPRESSION_LEVEL)
+            self._dctx = zstd.ZstdDecompressor()
+        else:
+            self._cctx = None
+            self._dctx = None
+        
+        # Last health check as (checked_at monotonic, healthy)
+        self._health_cache: Tuple[float, bool] = (float("-inf"), False)
+        
+        # Pending writes as (cache_key, ttl, payload, organization_id); created
+        # lazily because the queue and writer task need a running event loop
+        self._write_queue: Optional[asyncio.Queue] = None
+        self._writer_task: Optional[asyncio.Task] = None
     
     async def __aenter__(self):
         """Async context manager entry"""
@@ -36,45 +124,162 @@ class RedisCache:
     
     async def __aexit__(self, exc_type, exc_val, exc_tb):
         """Async context manager exit - cleanup connections"""
-        if hasattr(self.redis_client, 'close'):
-            await self.redis_client.close()
-        elif hasattr(self.redis_client, 'connection_pool'):
-            self.redis_client.connection_pool.disconnect()
+        await self.close()
     
-    def close(self):
-        """Close Redis connections"""
-        if hasattr(self.redis_client, 'connection_pool'):
-            self.redis_client.connection_pool.disconnect()
+    async def close(self):
+        """Flush pending writes and release this client; the shared connection pool stays open"""
+        if self._writer_task is not None:
+            await self._drain_writes()
+            self._writer_task.cancel()
+            self._writer_task = None
+        await self.redis_client.close()
     
-    def _generate_cache_key(self, prompt: str, model: str, **kwargs) -> str:
+    async def _drain_writes(self):
+        """Wait for queued writes to reach Redis, if the writer is running"""
+        if self._writer_task is None or self._writer_task.done():
+            # Nothing will drain the queue, so joining would hang
+            return
+        try:
+            await asyncio.wait_for(self._write_queue.join(), WRITE_DRAIN_TIMEOUT)
+        except asyncio.TimeoutError:
+            logger.warning("Cache write queue not drained within %ss", WRITE_DRAIN_TIMEOUT)
+    
+    def _enqueue_write(self, cache_key: str, ttl: int, payload: bytes, organization_id: Optional[str]):
+        """Hand a write to the background writer, starting it on first use"""
+        if self._writer_task is None or self._writer_task.done():
+            if self._write_queue is None:
+                self._write_queue = asyncio.Queue(maxsize=WRITE_QUEUE_MAX_SIZE)
+            self._writer_task = asyncio.get_running_loop().create_task(self._writer())
+        self._write_queue.put_nowait((cache_key, ttl, payload, organization_id))
+    
+    async def _writer(self):
+        """Drain queued writes, sending up to WRITE_BATCH_SIZE per pipeline"""
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._write_queue.get()]
+            deadline = loop.time() + WRITE_FLUSH_INTERVAL
+            while len(batch) < WRITE_BATCH_SIZE:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._write_queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+            
+            try:
+                pipe = self.redis_client.pipeline(transaction=False)
+                for cache_key, ttl, payload, organization_id in batch:
+                    pipe.setex(cache_key, ttl, payload)
+                    if organization_id:
+                        self._index_for_org(pipe, organization_id, [cache_key])
+                await pipe.execute()
+            except Exception:
+                logger.warning("Cache %s error", "write", exc_info=True)
+            finally:
+                for _ in batch:
+                    self._write_queue.task_done()
+    
+    @staticmethod
+    def _org_index_key(organization_id: str) -> str:
+        """Key of the set tracking an organization's cache entries"""
+        return f"llm_cache_index:org:{organization_id}"
+    
+    def _generate_cache_key(
+        self, prompt: str, model: str, organization_id: Optional[str] = None, **kwargs
+    ) -> str:
         """Generate a cache key for the request"""
-        # Create a hash of the request parameters
-        cache_data = {
-            "prompt": prompt,
-            "model": model,
-            **kwargs
-        }
+        # Feed fields to the hasher one at a time instead of building one big
+        # buffer; each is length-prefixed so field boundaries are unambiguous
+        hasher = hashlib.blake2b(digest_size=16)
+        
+        def _update(data: bytes):
+            hasher.update(len(data).to_bytes(8, "little"))
+            hasher.update(data)
         
-        # Sort keys for consistent hashing
-        cache_string = json.dumps(cache_data, sort_keys=True)
-        cache_hash = hashlib.sha256(cache_string.encode()).hexdigest()
+        if not kwargs:
+            _update(model.encode())
+            _update(prompt.encode())
+        elif kwargs.keys() == ROUTE_CACHE_PARAMS:
+            # Parameter set sent by /generate: same fields as the generic path
+            # below, but in a precomputed order and fed to the hasher at once
+            parts = [_frame(model.encode())]
+            for key, framed_key in _ROUTE_PARAM_FIELDS:
+                parts.append(framed_key)
+                parts.append(_frame(_encode_param(kwargs[key])))
+            hasher.update(b"".join(parts))
+            _update(prompt.encode())
+        else:
+            _update(model.encode())
+            for key in sorted(kwargs):
+                _update(key.encode())
+                _update(_encode_param(kwargs[key]))
+            _update(prompt.encode())
         
-        return f"llm_cache:{cache_hash}"
+        # 128-bit digest, base64url encoded to keep keys short
+        digest = base64.urlsafe_b64encode(hasher.digest()).rstrip(b"=").decode()
+        if organization_id:
+            return f"llm_cache:{organization_id}:{digest}"
+        return f"llm_cache:{digest}"
+    
+    def _encode(self, cache_data: Dict[str, Any]) -> bytes:
+        """Serialize a cache entry, compressing it when large enough to pay off"""
+        payload = orjson.dumps(cache_data)
+        if self._cctx is not None and len(payload) >= CACHE_COMPRESSION_MIN_BYTES:
+            return ZSTD_MAGIC + self._cctx.compress(payload)
+        return payload
     
-    async def get(self, prompt: str, model: str, **kwargs) -> Optional[Dict[str, Any]]:
+    def _decode(self, raw: bytes) -> Dict[str, Any]:
+        """Deserialize a cache entry written by _encode"""
+        if raw[:1] == ZSTD_MAGIC:
+            if self._dctx is None:
+                raise RuntimeError("zstandard is required to read compressed cache entries")
+            return orjson.loads(self._dctx.decompress(raw[1:]))
+        return orjson.loads(raw)
+    
+    def _local_get(self, cache_key: str) -> Optional[Dict[str, Any]]:
+        """Look up a response in the local LRU tier"""
+        entry = self._local.get(cache_key)
+        if entry is not None:
+            if entry[0] > time.monotonic():
+                self._local.move_to_end(cache_key)
+                self.local_hits += 1
+                return entry[1]
+            del self._local[cache_key]
+        
+        self.local_misses += 1
+        return None
+    
+    def _local_put(self, cache_key: str, value: Dict[str, Any], ttl: int = LOCAL_CACHE_TTL):
+        """Store a response in the local LRU tier, evicting the oldest entries"""
+        self._local[cache_key] = (time.monotonic() + min(ttl, LOCAL_CACHE_TTL), value)
+        self._local.move_to_end(cache_key)
+        while len(self._local) > LOCAL_CACHE_MAX_ENTRIES:
+            self._local.popitem(last=False)
+    
+    async def get(
+        self, prompt: str, model: str, organization_id: Optional[str] = None, **kwargs
+    ) -> Optional[Dict[str, Any]]:
         """Get cached response"""
         try:
-            cache_key = self._generate_cache_key(prompt, model, **kwargs)
-            cached_data = self.redis_client.get(cache_key)
+            cache_key = self._generate_cache_key(prompt, model, organization_id, **kwargs)
+            
+            local_value = self._local_get(cache_key)
+            if local_value is not None:
+                return local_value
+            
+            cached_data = await self.redis_client.get(cache_key)
             
             if cached_data:
-                return json.loads(cached_data)
+                value = self._decode(cached_data)
+                self._local_put(cache_key, value)
+                return value
             
             return None
             
-        except Exception as e:
+        except Exception:
             # Log error but don't fail the request
-            print(f"Cache get error: {e}")
+            logger.warning("Cache %s error", "get", exc_info=True)
             return None
     
     async def set(
@@ -83,11 +288,18 @@ class RedisCache:
         model: str, 
         response_data: Dict[str, Any], 
         ttl: int = DEFAULT_CACHE_TTL,
+        organization_id: Optional[str] = None,
         **kwargs
     ) -> bool:
-        """Cache response"""
+        """
+        Cache response
+        
+        The entry is visible in the local tier immediately; the Redis write is
+        queued and sent in a batch by the background writer, so the caller never
+        waits on a Redis round-trip.
+        """
         try:
-            cache_key = self._generate_cache_key(prompt, model, **kwargs)
+            cache_key = self._generate_cache_key(prompt, model, organization_id, **kwargs)
             
             # Add metadata to cached response
             cache_data = {
@@ -96,86 +308,170 @@ class RedisCache:
                 "cache_key": cache_key
             }
             
-            self.redis_client.setex(
-                cache_key,
-                ttl,
-                json.dumps(cache_data)
-            )
+            self._enqueue_write(cache_key, ttl, self._encode(cache_data), organization_id)
+            self._local_put(cache_key, cache_data, ttl)
             
             return True
             
-        except Exception as e:
-            print(f"Cache set error: {e}")
+        except Exception:
+            logger.warning("Cache %s error", "set", exc_info=True)
             return False
     
-    async def delete(self, prompt: str, model: str, **kwargs) -> bool:
+    async def delete(
+        self, prompt: str, model: str, organization_id: Optional[str] = None, **kwargs
+    ) -> bool:
         """Delete cached response"""
         try:
-            cache_key = self._generate_cache_key(prompt, model, **kwargs)
-            self.redis_client.delete(cache_key)
+            cache_key = self._generate_cache_key(prompt, model, organization_id, **kwargs)
+            self._local.pop(cache_key, None)
+            # A queued SETEX applied after the delete would bring the entry back
+            await self._drain_writes()
+            await self.redis_client.delete(cache_key)
+            return True
+            
+        except Exception:
+            logger.warning("Cache %s error", "delete", exc_info=True)
+            return False
+    
+    async def get_many(
+        self,
+        items: List[Tuple[str, str, Dict[str, Any]]],
+        organization_id: Optional[str] = None
+    ) -> List[Optional[Dict[str, Any]]]:
+        """Get cached responses for several (prompt, model, kwargs) requests in one round-trip"""
+        try:
+            pipe = self.redis_client.pipeline(transaction=False)
+            for prompt, model, kwargs in items:
+                pipe.get(self._generate_cache_key(prompt, model, organization_id, **kwargs))
+            
+            raw_values = await pipe.execute()
+            return [self._decode(value) if value else None for value in raw_values]
+            
+        except Exception:
+            logger.warning("Cache %s error", "get_many", exc_info=True)
+            return [None] * len(items)
+    
+    async def set_many(
+        self,
+        items: List[Tuple[str, str, Dict[str, Any], Dict[str, Any]]],
+        ttl: int = DEFAULT_CACHE_TTL,
+        organization_id: Optional[str] = None
+    ) -> bool:
+        """Cache several (prompt, model, response_data, kwargs) entries in one round-trip"""
+        try:
+            cached_at = str(datetime.utcnow())
+            pipe = self.redis_client.pipeline(transaction=False)
+            cache_keys = []
+            
+            for prompt, model, response_data, kwargs in items:
+                cache_key = self._generate_cache_key(prompt, model, organization_id, **kwargs)
+                cache_keys.append(cache_key)
+                cache_data = {
+                    **response_data,
+                    "cached_at": cached_at,
+                    "cache_key": cache_key
+                }
+                pipe.setex(cache_key, ttl, self._encode(cache_data))
+                self._local_put(cache_key, cache_data, ttl)
+            
+            if organization_id and cache_keys:
+                self._index_for_org(pipe, organization_id, cache_keys)
+            
+            await pipe.execute()
             return True
             
-        except Exception as e:
-            print(f"Cache delete error: {e}")
+        except Exception:
+            logger.warning("Cache %s error", "set_many", exc_info=True)
             return False
     
+    def _index_for_org(self, pipe, organization_id: str, cache_keys: List[str]):
+        """Queue commands recording cache keys in the organization's index set"""
+        index_key = self._org_index_key(organization_id)
+        pipe.sadd(index_key, *cache_keys)
+        pipe.expire(index_key, LONG_CACHE_TTL)
+    
     async def clear_user_cache(self, organization_id: str) -> int:
         """Clear all cache for an organization"""
         try:
-            pattern = f"llm_cache:*:org:{organization_id}:*"
-            keys = self.redis_client.keys(pattern)
+            # The index set lists exactly this organization's keys, so eviction
+            # costs O(org keys) with no keyspace scan
+            index_key = self._org_index_key(organization_id)
+            # Queued writes must land (and be indexed) before the index is read,
+            # or they would repopulate the organization's cache afterwards
+            await self._drain_writes()
+            members = [
+                key.decode() if isinstance(key, bytes) else key
+                for key in await self.redis_client.smembers(index_key)
+            ]
             
-            if keys:
-                return self.redis_client.delete(*keys)
+            pipe = self.redis_client.pipeline(transaction=False)
+            for start in range(0, len(members), DELETE_BATCH_SIZE):
+                batch = members[start:start + DELETE_BATCH_SIZE]
+                pipe.unlink(*batch)
+                for key in batch:
+                    self._local.pop(key, None)
+            pipe.delete(index_key)
+            results = await pipe.execute()
             
-            return 0
+            return sum(results[:-1])
             
-        except Exception as e:
-            print(f"Cache clear error: {e}")
+        except Exception:
+            logger.warning("Cache %s error", "clear", exc_info=True)
             return 0
     
     async def get_cache_stats(self) -> Dict[str, Any]:
         """Get cache statistics"""
         try:
-            info = self.redis_client.info('memory')
-            keyspace = self.redis_client.info('keyspace')
-            
-            # Count LLM cache keys
-            cache_keys = self.redis_client.keys("llm_cache:*")
+            # Fetch everything in a single round-trip
+            pipe = self.redis_client.pipeline(transaction=False)
+            pipe.info('memory')
+            pipe.info('keyspace')
+            pipe.info('stats')
+            pipe.dbsize()
+            info, keyspace, stats, total_keys = await pipe.execute()
             
             return {
-                "total_keys": len(cache_keys),
+                "total_keys": total_keys,
                 "memory_used": info.get('used_memory_human', '0'),
-                "hit_rate": self._calculate_hit_rate(),
-                "keyspace_info": keyspace
+                "hit_rate": self._calculate_hit_rate(stats),
+                "keyspace_info": keyspace,
+                "local_cache": {
+                    "size": len(self._local),
+                    "hits": self.local_hits,
+                    "misses": self.local_misses
+                }
             }
             
-        except Exception as e:
-            print(f"Cache stats error: {e}")
+        except Exception:
+            logger.warning("Cache %s error", "stats", exc_info=True)
             return {}
     
-    def _calculate_hit_rate(self) -> float:
-        """Calculate cache hit rate from Redis stats"""
-        try:
-            info = self.redis_client.info('stats')
-            hits = info.get('keyspace_hits', 0)
-            misses = info.get('keyspace_misses', 0)
-            
-            if hits + misses == 0:
-                return 0.0
-            
-            return hits / (hits + misses) * 100
-            
-        except Exception:
+    @staticmethod
+    def _calculate_hit_rate(stats: Dict[str, Any]) -> float:
+        """Calculate cache hit rate from Redis INFO stats"""
+        hits = stats.get('keyspace_hits', 0)
+        misses = stats.get('keyspace_misses', 0)
+        
+        if hits + misses == 0:
             return 0.0
+        
+        return hits / (hits + misses) * 100
     
-    def is_healthy(self) -> bool:
-        """Check if Redis is healthy"""
+    async def is_healthy(self) -> bool:
+        """Check if Redis is healthy, reusing the last result for HEALTH_CHECK_TTL"""
+        now = time.monotonic()
+        checked_at, healthy = self._health_cache
+        if now - checked_at < HEALTH_CHECK_TTL:
+            return healthy
+        
         try:
-            self.redis_client.ping()
-            return True
+            await self.redis_client.ping()
+            healthy = True
         except Exception:
-            return False
+            healthy = False
+        
+        self._health_cache = (now, healthy)
+        return healthy
 
 
 # Global cache instance
@@ -195,4 +491,21 @@ async def cache_response(
     **kwargs
 ) -> bool:
     """Cache LLM response"""
-    return await cache.set(prompt, model, response_data, ttl, **kwargs)
\ No newline at end of file
+    return await cache.set(prompt, model, response_data, ttl, **kwargs)
+
+
+async def get_cached_responses(
+    items: List[Tuple[str, str, Dict[str, Any]]],
+    organization_id: Optional[str] = None
+) -> List[Optional[Dict[str, Any]]]:
+    """Get cached LLM responses for a batch of (prompt, model, kwargs) requests"""
+    return await cache.get_many(items, organization_id)
+
+
+async def cache_responses(
+    items: List[Tuple[str, str, Dict[str, Any], Dict[str, Any]]],
+    ttl: int = DEFAULT_CACHE_TTL,
+    organization_id: Optional[str] = None
+) -> bool:
+    """Cache a batch of (prompt, model, response_data, kwargs) LLM responses"""
+    return await cache.set_many(items, ttl, organization_id)
@@ -2,65 +2,57 @@
 Configuration management for Model Bridge - Standalone Version
 """
 import os
-from typing import List, Optional, Dict, Any
-from pydantic import BaseModel, Field
+from dataclasses import dataclass, field
+from typing import Tuple, Optional, Dict, Mapping
 from dotenv import load_dotenv
 
 load_dotenv()
 
 
-class DynamicProviderConfig(BaseModel):
+@dataclass(frozen=True)
+class DynamicProviderConfig:
     """Dynamic provider configuration based on available API keys"""
     enabled: bool = False
     api_key: str = ""
     priority: int = 999  # Lower number = higher priority
     
     @classmethod
-    def from_env(cls, provider_name: str) -> 'DynamicProviderConfig':
-        """Create provider config from environment variables"""
+    def from_env(cls, provider_name: str, env: Mapping[str, str] = os.environ) -> 'DynamicProviderConfig':
+        """Create provider config from environment variables (or a snapshot of them)"""
         env_prefix = provider_name.upper()
-        api_key = os.getenv(f"{env_prefix}_API_KEY", "")
+        api_key = env.get(env_prefix + "_API_KEY", "")
         
         return cls(
             enabled=bool(api_key),
             api_key=api_key,
-            priority=int(os.getenv(f"{env_prefix}_PRIORITY", "999"))
+            priority=int(env.get(env_prefix + "_PRIORITY", "999"))
         )
 
 
-class Config(BaseModel):
+# Providers whose configuration is read from the environment
+PROVIDER_NAMES = (
+    "openai",
+    "anthropic",
+    "google",
+    "groq",
+    "together",
+    "mistral",
+    "cohere",
+    "perplexity",
+    "huggingface",
+    "deepseek",
+    "ollama",
+    "openrouter",
+    "mock",
+)
+
+
+@dataclass(frozen=True)
+class Config:
     """Application configuration for standalone Model Bridge"""
     
     # Dynamic Provider Configuration
-    providers: Dict[str, DynamicProviderConfig] = Field(default_factory=lambda: {
-        "openai": DynamicProviderConfig.from_env("openai"),
-        "anthropic": DynamicProviderConfig.from_env("anthropic"),
-        "google": DynamicProviderConfig.from_env("google"),
-        "groq": DynamicProviderConfig.from_env("groq"),
-        "together": DynamicProviderConfig.from_env("together"),
-        "mistral": DynamicProviderConfig.from_env("mistral"),
-        "cohere": DynamicProviderConfig.from_env("cohere"),
-        "perplexity": DynamicProviderConfig.from_env("perplexity"),
-        "huggingface": DynamicProviderConfig.from_env("huggingface"),
-        "deepseek": DynamicProviderConfig.from_env("deepseek"),
-        "ollama": DynamicProviderConfig.from_env("ollama"),
-        "openrouter": DynamicProviderConfig.from_env("openrouter"),
-        "mock": DynamicProviderConfig.from_env("mock"),
-    })
-    
-    # Available providers (only those with valid API keys)
-    @property
-    def available_providers(self) -> List[str]:
-        """Get list of providers with valid API keys"""
-        return [name for name, config in self.providers.items() if config.enabled]
-    
-    @property
-    def primary_provider(self) -> Optional[str]:
-        """Get the primary provider (lowest priority number)"""
-        enabled_providers = [(name, config) for name, config in self.providers.items() if config.enabled]
-        if not enabled_providers:
-            return None
-        return min(enabled_providers, key=lambda x: x[1].priority)[0]
+    providers: Dict[str, DynamicProviderConfig] = field(default_factory=dict)
     
     # LLM Configuration
     model_name: str = "gpt-4"
@@ -68,10 +60,10 @@ class Config(BaseModel):
     max_tokens: int = 4000
     
     # Logging Configuration
-    log_level: str = Field(default_factory=lambda: os.getenv("LOG_LEVEL", "INFO"))
+    log_level: str = field(default_factory=lambda: os.getenv("LOG_LEVEL", "INFO"))
     
     # Model Routing Configuration: Maps a logical task to a model alias from models_config.yaml
-    model_routing: dict = Field(default_factory=lambda: {
+    model_routing: dict = field(default_factory=lambda: {
         "triage": "fast",
         "outcome_detection": "fast",
         "initial_analysis_simple": "fast",
@@ -84,7 +76,25 @@ class Config(BaseModel):
         "action_item_extraction": "default_balanced",
         "summary_generation": "fast"
     })
+    
+    # Derived from providers once at construction
+    available_providers: Tuple[str, ...] = field(init=False)  # providers with valid API keys
+    primary_provider: Optional[str] = field(init=False)  # lowest priority number
+    
+    def __post_init__(self):
+        enabled_providers = [(name, config) for name, config in self.providers.items() if config.enabled]
+        primary_provider = min(enabled_providers, key=lambda x: x[1].priority)[0] if enabled_providers else None
+        # Frozen instances reject normal assignment, even during construction
+        object.__setattr__(self, "available_providers", tuple(name for name, _ in enabled_providers))
+        object.__setattr__(self, "primary_provider", primary_provider)
+    
+    @classmethod
+    def load(cls) -> 'Config':
+        """Build the configuration from environment variables"""
+        # Read every provider from one snapshot rather than os.environ per lookup
+        env = dict(os.environ)
+        return cls(providers={name: DynamicProviderConfig.from_env(name, env) for name in PROVIDER_NAMES})
 
 
 # Global configuration instance
-config = Config()
\ No newline at end of file
+config = Config.load()
@@ -2,40 +2,66 @@
 Logging setup for WinCraft AI
 """
 import logging
-import sys
+import logging.config
 from typing import Optional
 from core.config import config
 
+# Resolved once at import time
+_LEVEL = getattr(logging, config.log_level.upper())
+
+_configured = False
+
+
+def setup_logging() -> None:
+    """
+    Configure the root logger once per process
+
+    Module loggers propagate to the root, so a single stdout handler and
+    formatter serve every logger in the application. Called from the
+    application entrypoints only; importing library modules never touches
+    the root logger. Safe to call repeatedly.
+    """
+    global _configured
+    if _configured:
+        return
+
+    logging.config.dictConfig({
+        "version": 1,
+        "disable_existing_loggers": False,
+        "formatters": {
+            "default": {
+                "format": "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+            }
+        },
+        "handlers": {
+            "console": {
+                "class": "logging.StreamHandler",
+                "stream": "ext://sys.stdout",
+                "formatter": "default",
+                "level": _LEVEL
+            }
+        },
+        "root": {
+            "handlers": ["console"],
+            "level": _LEVEL
+        }
+    })
+    _configured = True
+
 
 def get_logger(name: str, level: Optional[str] = None) -> logging.Logger:
     """
-    Get a configured logger instance
-    
+    Get a logger instance
+
     Args:
         name: Logger name (usually __name__)
         level: Log level override
-        
+
     Returns:
-        Configured logger instance
+        Logger instance
     """
     logger = logging.getLogger(name)
-    
-    # Set level
-    log_level = level or config.log_level
-    logger.setLevel(getattr(logging, log_level.upper()))
-    
-    # Avoid adding multiple handlers
-    if not logger.handlers:
-        # Console handler
-        console_handler = logging.StreamHandler(sys.stdout)
-        console_handler.setLevel(getattr(logging, log_level.upper()))
-        
-        # Formatter
-        formatter = logging.Formatter(
-            '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-        )
-        console_handler.setFormatter(formatter)
-        
-        logger.addHandler(console_handler)
-    
-    return logger
\ No newline at end of file
+    if level:
+        logger.setLevel(getattr(logging, level.upper()))
+
+    return logger
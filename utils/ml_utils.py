@@ -4,16 +4,45 @@ Provides lightweight ML capabilities for provider performance prediction
 """
 
 import numpy as np
-import json
+import re
+import orjson
 import logging
-from typing import Dict, List, Any, Optional, Tuple
+import threading
+from typing import Dict, List, Any, Optional, Tuple, Deque, Mapping
 from datetime import datetime, timedelta
 from dataclasses import dataclass
-from collections import defaultdict
+from collections import defaultdict, deque
 import math
 
 logger = logging.getLogger(__name__)
 
+# Words suggesting a prompt needs more work from the model
+COMPLEXITY_INDICATORS = frozenset({'analyze', 'explain', 'complex', 'detailed', 'comprehensive'})
+_WORD_RE = re.compile(r'[a-z]+')
+
+# Feature names in feature-vector order, as reported in feature importance
+FEATURE_NAMES = (
+    'request_length', 'request_complexity', 'task_type', 'time_of_day',
+    'day_of_week', 'historical_response_time', 'historical_success_rate',
+    'recent_error_rate', 'provider_load', 'request_similarity'
+)
+_FEATURE_INDEX = {name: index for index, name in enumerate(FEATURE_NAMES)}
+
+# Training point keys holding the per-request feature columns, in matrix order
+REQUEST_FEATURE_KEYS = ('request_length', 'request_complexity', 'task_type_encoded', 'time_of_day', 'day_of_week')
+
+# Ridge added to the normal equations so constant feature columns get zero
+# weight instead of making the system singular
+NORMAL_EQUATIONS_RIDGE = 1e-8
+
+# A due retrain is skipped unless at least this many points arrived since the
+# last one and a target's recent mean moved by this fraction of its std
+RETRAIN_MIN_NEW_POINTS = 10
+RETRAIN_DRIFT_THRESHOLD = 0.05
+
+# Number of most recent requests the provider statistics are computed over
+RECENT_STATS_WINDOW = 50
+
 
 @dataclass
 class PredictionFeatures:
@@ -36,7 +65,57 @@ class ModelPrediction:
     predicted_response_time: float
     predicted_success_rate: float
     confidence_score: float
-    feature_importance: Dict[str, float]
+    feature_importance: Mapping[str, float]
+
+
+class FeatureImportance(Mapping):
+    """
+    Read-only feature name -> importance view over a model's importance array
+    
+    Values are converted to Python floats only when read, so predictions whose
+    importance is never inspected don't pay for building a dict. Use dict() on
+    it where a real dict is needed.
+    """
+    __slots__ = ('_importance',)
+    
+    def __init__(self, importance: np.ndarray):
+        self._importance = importance
+    
+    def __getitem__(self, name: str) -> float:
+        index = _FEATURE_INDEX.get(name)
+        if index is None or index >= len(self._importance):
+            raise KeyError(name)
+        return float(self._importance[index])
+    
+    def __iter__(self):
+        return iter(FEATURE_NAMES[:len(self._importance)])
+    
+    def __len__(self) -> int:
+        return len(self._importance)
+    
+    def __repr__(self) -> str:
+        return repr(dict(self))
+
+
+def _fit_normal_equations(X_norm: np.ndarray, y: np.ndarray) -> np.ndarray:
+    """
+    Solve least squares for normalized features plus a bias term
+    
+    Returns the weights followed by the bias. Uses the normal equations, which
+    for the handful of features here is a tiny square solve; a small ridge on
+    the feature weights keeps it well-posed when a feature column is constant
+    (all zero once normalized).
+    """
+    n_samples, n_features = X_norm.shape
+    X_aug = np.ones((n_samples, n_features + 1))
+    X_aug[:, :n_features] = X_norm
+    
+    A = X_aug.T @ X_aug
+    for i in range(n_features):
+        A[i, i] += NORMAL_EQUATIONS_RIDGE
+    b = X_aug.T @ y
+    
+    return np.linalg.solve(A, b)
 
 
 class SimpleLinearRegression:
@@ -51,18 +130,31 @@ class SimpleLinearRegression:
         self.is_trained = False
         self.feature_means = None
         self.feature_stds = None
+        self._inv_stds = None
+        # Normalization folded into the weights, so predict is one mat-vec
+        self._scaled_weights = None
+        self._pred_offset = None
+        self._feature_importance = None
     
     def _normalize_features(self, X: np.ndarray) -> np.ndarray:
         """Normalize features using z-score normalization"""
         if self.feature_means is None:
-            self.feature_means = np.mean(X, axis=0)
-            self.feature_stds = np.std(X, axis=0)
-            # Avoid division by zero
-            self.feature_stds[self.feature_stds == 0] = 1.0
+            self.set_feature_stats(np.mean(X, axis=0), np.std(X, axis=0))
         
-        return (X - self.feature_means) / self.feature_stds
+        return (X - self.feature_means) * self._inv_stds
+    
+    def set_feature_stats(self, feature_means: np.ndarray, feature_stds: np.ndarray):
+        """Set the normalization statistics and cache the inverse stds"""
+        feature_stds = np.array(feature_stds, dtype=np.float64)
+        # Avoid division by zero; constant columns can come out with a
+        # rounding-error std (~1e-17) rather than exactly 0
+        feature_stds[feature_stds < 1e-8] = 1.0
+        
+        self.feature_means = np.asarray(feature_means, dtype=np.float32)
+        self.feature_stds = feature_stds.astype(np.float32)
+        self._inv_stds = (1.0 / feature_stds).astype(np.float32)
     
-    def train(self, X: np.ndarray, y: np.ndarray, learning_rate: float = 0.01, epochs: int = 1000):
+    def train(self, X: np.ndarray, y: np.ndarray):
         """Train the linear regression model"""
         if len(X) == 0:
             logger.warning("No training data provided")
@@ -71,31 +163,18 @@ class SimpleLinearRegression:
         # Normalize features
         X_norm = self._normalize_features(X)
         
-        # Initialize weights and bias
-        n_features = X_norm.shape[1]
-        self.weights = np.random.normal(0, 0.01, n_features)
-        self.bias = 0.0
+        # Solve the least-squares problem in closed form
+        X_norm = np.asarray(X_norm, dtype=np.float64)
+        y = np.asarray(y, dtype=np.float64)
+        solution = _fit_normal_equations(X_norm, y)
         
-        # Gradient descent
-        n_samples = len(X_norm)
-        for epoch in range(epochs):
-            # Forward pass
-            predictions = np.dot(X_norm, self.weights) + self.bias
-            
-            # Compute loss (MSE)
-            loss = np.mean((predictions - y) ** 2)
-            
-            # Backward pass
-            dw = (2 / n_samples) * np.dot(X_norm.T, (predictions - y))
-            db = (2 / n_samples) * np.sum(predictions - y)
-            
-            # Update weights
-            self.weights -= learning_rate * dw
-            self.bias -= learning_rate * db
-            
-            # Early stopping if loss is very small
-            if loss < 1e-6:
-                break
+        # The solve runs in float64; parameters are kept in float32
+        self.weights = solution[:-1].astype(np.float32)
+        self.bias = float(solution[-1])
+        self._precompute_prediction_params()
+        
+        # Compute loss (MSE)
+        loss = np.mean((np.dot(X_norm, self.weights) + self.bias - y) ** 2)
         
         self.is_trained = True
         logger.info(f"Model trained with final loss: {loss:.6f}")
@@ -106,20 +185,30 @@ class SimpleLinearRegression:
             logger.warning("Model not trained, returning zeros")
             return np.zeros(len(X))
         
-        X_norm = (X - self.feature_means) / self.feature_stds
-        return np.dot(X_norm, self.weights) + self.bias
+        # ((X - means) / stds) . w + b  ==  X . (w / stds) + (b - means . (w / stds))
+        X = np.asarray(X, dtype=np.float32)
+        return np.einsum('ij,j->i', X, self._scaled_weights) + self._pred_offset
+    
+    def _precompute_prediction_params(self):
+        """Precompute everything derived from the fitted parameters"""
+        # Normalization-folded weights and offset used by predict
+        self._scaled_weights = self.weights * self._inv_stds
+        # A single scalar, so accumulate it in float64 to limit cancellation error
+        self._pred_offset = self.bias - float(np.dot(
+            self.feature_means.astype(np.float64), self._scaled_weights.astype(np.float64)
+        ))
+        
+        # Normalize weights to get relative importance
+        abs_weights = np.abs(self.weights)
+        total = np.sum(abs_weights)
+        self._feature_importance = abs_weights / total if total else abs_weights
     
     def get_feature_importance(self) -> np.ndarray:
         """Get feature importance based on absolute weights"""
         if not self.is_trained:
             return np.zeros(len(self.weights) if self.weights is not None else 0)
         
-        # Normalize weights to get relative importance
-        abs_weights = np.abs(self.weights)
-        if np.sum(abs_weights) == 0:
-            return abs_weights
-        
-        return abs_weights / np.sum(abs_weights)
+        return self._feature_importance
 
 
 class PerformancePredictor:
@@ -132,11 +221,44 @@ class PerformancePredictor:
         self.max_history_size = max_history_size
         self.response_time_models: Dict[str, SimpleLinearRegression] = {}
         self.success_rate_models: Dict[str, SimpleLinearRegression] = {}
-        self.training_data: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+        # Bounded per provider; appending past max_history_size evicts the oldest point
+        self.training_data: Dict[str, Deque[Dict[str, Any]]] = defaultdict(
+            lambda: deque(maxlen=self.max_history_size)
+        )
         self.feature_stats: Dict[str, Dict[str, float]] = {}
         self.task_type_encoding: Dict[str, int] = {}
         self.last_training_time: Dict[str, datetime] = {}
         self.retrain_interval = timedelta(minutes=30)
+        # Sliding window of recent (response_time, success) per provider
+        recent_window_size = min(RECENT_STATS_WINDOW, max_history_size)
+        self._recent_window: Dict[str, Deque[Tuple[float, bool]]] = defaultdict(
+            lambda: deque(maxlen=recent_window_size)
+        )
+        self._recent_response_time_sum: Dict[str, float] = defaultdict(float)
+        self._recent_success_sum: Dict[str, int] = defaultdict(int)
+        # Retrain gating: points added since the last training, and for each
+        # target the (stats key, recent mean, target std) it was trained at
+        self._points_since_training: Dict[str, int] = defaultdict(int)
+        self._training_baseline: Dict[str, Tuple[Tuple[str, float, float], ...]] = {}
+        # Trained models as structure-of-arrays: provider -> row of (P, 10)
+        # normalization-folded weights and (P,) offsets, one pair per target
+        self._provider_index: Dict[str, int] = {}
+        self._rt_weights: np.ndarray
+        self._rt_offsets: np.ndarray
+        self._sr_weights: np.ndarray
+        self._sr_offsets: np.ndarray
+        self._reset_model_rows()
+        # Named feature importance per provider, dropped when its model changes
+        self._feature_importance_cache: Dict[str, FeatureImportance] = {}
+        # Per-thread feature row reused by predict_performance
+        self._thread_local = threading.local()
+    
+    def _feature_buffer(self) -> np.ndarray:
+        """Get the calling thread's preallocated (1, 10) feature row"""
+        buffer = getattr(self._thread_local, 'feature_buffer', None)
+        if buffer is None:
+            buffer = self._thread_local.feature_buffer = np.empty((1, 10), dtype=np.float32)
+        return buffer
     
     def _encode_task_type(self, task_type: Optional[str]) -> float:
         """Encode task type as numeric value"""
@@ -148,26 +270,31 @@ class PerformancePredictor:
         
         return float(self.task_type_encoding[task_type])
     
-    def _extract_features(self, request_data: Dict[str, Any], provider_name: str) -> PredictionFeatures:
-        """Extract features from request data"""
+    def _extract_request_features(self, request_data: Dict[str, Any],
+                                  now: Optional[datetime] = None) -> Tuple[float, float, float, float, float]:
+        """Extract the per-request features (everything not derived from provider stats)"""
         # Request features
         prompt = request_data.get('prompt', '')
         request_length = len(prompt) / 1000.0  # Normalize to thousands of chars
         
         # Simple complexity estimation based on length and content
-        complexity_indicators = ['analyze', 'explain', 'complex', 'detailed', 'comprehensive']
-        complexity_score = sum(1 for word in complexity_indicators if word in prompt.lower())
-        request_complexity = min(complexity_score / len(complexity_indicators), 1.0)
+        words = set(_WORD_RE.findall(prompt.lower()))
+        request_complexity = len(words & COMPLEXITY_INDICATORS) / len(COMPLEXITY_INDICATORS)
         
         # Task type encoding
         task_type = request_data.get('task_type')
         task_type_encoded = self._encode_task_type(task_type)
         
         # Time features
-        now = datetime.utcnow()
+        if now is None:
+            now = datetime.utcnow()
         time_of_day = now.hour / 24.0
         day_of_week = now.weekday() / 7.0
         
+        return request_length, request_complexity, task_type_encoded, time_of_day, day_of_week
+    
+    def _extract_provider_features(self, provider_name: str) -> Tuple[float, float, float, float, float]:
+        """Extract the provider features, shared by every request to that provider"""
         # Provider historical features
         provider_stats = self.feature_stats.get(provider_name, {})
         historical_avg_response_time = provider_stats.get('avg_response_time', 2.0)
@@ -180,104 +307,129 @@ class PerformancePredictor:
         # Request similarity (placeholder - could be improved with embeddings)
         request_similarity = 0.5
         
+        return (
+            historical_avg_response_time,
+            historical_success_rate,
+            recent_error_rate,
+            provider_load,
+            request_similarity
+        )
+    
+    def _extract_features(self, request_data: Dict[str, Any], provider_name: str,
+                          now: Optional[datetime] = None) -> PredictionFeatures:
+        """Extract features from request data"""
         return PredictionFeatures(
-            request_length=request_length,
-            request_complexity=request_complexity,
-            task_type_encoded=task_type_encoded,
-            time_of_day=time_of_day,
-            day_of_week=day_of_week,
-            historical_avg_response_time=historical_avg_response_time,
-            historical_success_rate=historical_success_rate,
-            recent_error_rate=recent_error_rate,
-            provider_load=provider_load,
-            request_similarity=request_similarity
+            *self._extract_request_features(request_data, now),
+            *self._extract_provider_features(provider_name)
         )
     
     def add_training_data(self, provider_name: str, request_data: Dict[str, Any], 
                          response_time: float, success: bool):
         """Add training data point"""
+        # One timestamp for everything this data point touches
+        now = datetime.utcnow()
+        
+        # Request features are fixed once the request is made, so compute them
+        # here rather than on every retrain
+        request_length, request_complexity, task_type_encoded, time_of_day, day_of_week = \
+            self._extract_request_features(request_data, now)
+        
         training_point = {
             'request_data': request_data,
+            'request_length': request_length,
+            'request_complexity': request_complexity,
+            'task_type_encoded': task_type_encoded,
+            'time_of_day': time_of_day,
+            'day_of_week': day_of_week,
             'response_time': response_time,
             'success': success,
-            'timestamp': datetime.utcnow()
+            'timestamp': now
         }
         
         self.training_data[provider_name].append(training_point)
-        
-        # Keep only recent data
-        if len(self.training_data[provider_name]) > self.max_history_size:
-            self.training_data[provider_name].pop(0)
+        self._points_since_training[provider_name] += 1
         
         # Update feature statistics
-        self._update_feature_stats(provider_name)
+        self._update_feature_stats(provider_name, response_time, success, now)
         
         # Check if we need to retrain
-        if self._should_retrain(provider_name):
-            self._train_models(provider_name)
+        if self._should_retrain(provider_name, now):
+            self._train_models(provider_name, now)
     
-    def _update_feature_stats(self, provider_name: str):
-        """Update feature statistics for a provider"""
-        data = self.training_data[provider_name]
-        if not data:
-            return
-        
-        # Calculate recent statistics (last 50 requests)
-        recent_data = data[-50:]
-        
-        response_times = [d['response_time'] for d in recent_data]
-        successes = [d['success'] for d in recent_data]
+    def _update_feature_stats(self, provider_name: str, response_time: float, success: bool,
+                              now: Optional[datetime] = None):
+        """Update feature statistics for a provider with a new data point"""
+        # Statistics cover the most recent requests; running sums are adjusted
+        # for the point entering and the one leaving the window
+        window = self._recent_window[provider_name]
+        if len(window) == window.maxlen:
+            old_response_time, old_success = window[0]
+            self._recent_response_time_sum[provider_name] -= old_response_time
+            self._recent_success_sum[provider_name] -= old_success
+        window.append((response_time, success))
+        self._recent_response_time_sum[provider_name] += response_time
+        self._recent_success_sum[provider_name] += success
+        
+        count = len(window)
+        success_rate = self._recent_success_sum[provider_name] / count
         
         self.feature_stats[provider_name] = {
-            'avg_response_time': np.mean(response_times),
-            'success_rate': np.mean(successes),
-            'recent_error_rate': 1.0 - np.mean(successes),
-            'load': len(recent_data) / 100.0,  # Simplified load metric
-            'last_updated': datetime.utcnow()
+            'avg_response_time': self._recent_response_time_sum[provider_name] / count,
+            'success_rate': success_rate,
+            'recent_error_rate': 1.0 - success_rate,
+            'load': count / 100.0,  # Simplified load metric
+            'last_updated': now or datetime.utcnow()
         }
     
-    def _should_retrain(self, provider_name: str) -> bool:
+    def _should_retrain(self, provider_name: str, now: Optional[datetime] = None) -> bool:
         """Check if model should be retrained"""
         if provider_name not in self.last_training_time:
             return len(self.training_data[provider_name]) >= 20  # Minimum data for training
         
-        time_since_training = datetime.utcnow() - self.last_training_time[provider_name]
-        return time_since_training >= self.retrain_interval
+        time_since_training = (now or datetime.utcnow()) - self.last_training_time[provider_name]
+        if time_since_training < self.retrain_interval:
+            return False
+        
+        # Skip retrains that would refit on essentially the same data
+        if self._points_since_training[provider_name] < RETRAIN_MIN_NEW_POINTS:
+            return False
+        return self._has_drifted(provider_name)
+    
+    def _has_drifted(self, provider_name: str) -> bool:
+        """Check if recent response times or success rates moved since the last training"""
+        baseline = self._training_baseline.get(provider_name)
+        if baseline is None:
+            return True
+        
+        stats = self.feature_stats[provider_name]
+        for key, trained_mean, trained_std in baseline:
+            # Relative to the target's spread at training time; with no spread
+            # any change at all counts
+            if abs(stats[key] - trained_mean) > RETRAIN_DRIFT_THRESHOLD * trained_std:
+                return True
+        return False
     
-    def _train_models(self, provider_name: str):
+    def _train_models(self, provider_name: str, now: Optional[datetime] = None):
         """Train ML models for a provider"""
         data = self.training_data[provider_name]
         if len(data) < 10:  # Need minimum data
             return
         
         try:
-            # Prepare training data
-            X = []
-            y_response_time = []
-            y_success_rate = []
+            # Prepare training data: per-request columns were stored with each
+            # point, the provider columns are the same for every row
+            n_samples = len(data)
+            X = np.empty((n_samples, 10), dtype=np.float64)
+            for column, key in enumerate(REQUEST_FEATURE_KEYS):
+                X[:, column] = np.fromiter((point[key] for point in data), dtype=np.float64, count=n_samples)
+            X[:, 5:] = self._extract_provider_features(provider_name)
             
-            for point in data:
-                features = self._extract_features(point['request_data'], provider_name)
-                feature_vector = [
-                    features.request_length,
-                    features.request_complexity,
-                    features.task_type_encoded,
-                    features.time_of_day,
-                    features.day_of_week,
-                    features.historical_avg_response_time,
-                    features.historical_success_rate,
-                    features.recent_error_rate,
-                    features.provider_load,
-                    features.request_similarity
-                ]
-                
-                X.append(feature_vector)
-                y_response_time.append(point['response_time'])
-                y_success_rate.append(float(point['success']))
-            
-            X = np.array(X)
-            y_response_time = np.array(y_response_time)
-            y_success_rate = np.array(y_success_rate)
+            y_response_time = np.fromiter(
+                (point['response_time'] for point in data), dtype=np.float64, count=n_samples
+            )
+            y_success_rate = np.fromiter(
+                (point['success'] for point in data), dtype=np.float64, count=n_samples
+            )
             
             # Train response time model
             if provider_name not in self.response_time_models:
@@ -291,33 +443,45 @@ class PerformancePredictor:
             
             self.success_rate_models[provider_name].train(X, y_success_rate)
             
-            self.last_training_time[provider_name] = datetime.utcnow()
+            self.last_training_time[provider_name] = now or datetime.utcnow()
+            self._points_since_training[provider_name] = 0
+            stats = self.feature_stats[provider_name]
+            self._training_baseline[provider_name] = (
+                ('avg_response_time', stats['avg_response_time'], float(np.std(y_response_time))),
+                ('success_rate', stats['success_rate'], float(np.std(y_success_rate)))
+            )
+            self._store_model_row(provider_name)
+            self._feature_importance_cache.pop(provider_name, None)
             
             logger.info(f"Trained models for provider {provider_name} with {len(data)} data points")
             
         except Exception as e:
             logger.error(f"Error training models for {provider_name}: {str(e)}")
     
-    def predict_performance(self, provider_name: str, request_data: Dict[str, Any]) -> ModelPrediction:
+    def predict_performance(self, provider_name: str, request_data: Dict[str, Any],
+                            now: Optional[datetime] = None) -> ModelPrediction:
         """Predict provider performance for a request"""
-        # Extract features
-        features = self._extract_features(request_data, provider_name)
-        feature_vector = np.array([[
-            features.request_length,
-            features.request_complexity,
-            features.task_type_encoded,
-            features.time_of_day,
-            features.day_of_week,
-            features.historical_avg_response_time,
-            features.historical_success_rate,
-            features.recent_error_rate,
-            features.provider_load,
-            features.request_similarity
-        ]])
+        # Extract features into this thread's reusable row buffer
+        provider_features = self._extract_provider_features(provider_name)
+        feature_vector = self._feature_buffer()
+        feature_vector[0, :5] = self._extract_request_features(request_data, now)
+        feature_vector[0, 5:] = provider_features
+        
+        # Trained providers: read parameters straight from the stacked arrays
+        row = self._provider_index.get(provider_name)
+        if row is not None:
+            features = feature_vector[0]
+            predicted_success_rate = float(np.dot(self._sr_weights[row], features) + self._sr_offsets[row])
+            return ModelPrediction(
+                predicted_response_time=float(np.dot(self._rt_weights[row], features) + self._rt_offsets[row]),
+                predicted_success_rate=max(0.0, min(1.0, predicted_success_rate)),  # Clamp to [0,1]
+                confidence_score=1.0,  # Both models available
+                feature_importance=self._feature_importance(provider_name)
+            )
         
         # Default predictions
-        predicted_response_time = features.historical_avg_response_time
-        predicted_success_rate = features.historical_success_rate
+        predicted_response_time = provider_features[0]
+        predicted_success_rate = provider_features[1]
         confidence_score = 0.5  # Low confidence without trained models
         
         # Use trained models if available
@@ -336,26 +500,104 @@ class PerformancePredictor:
             except Exception as e:
                 logger.warning(f"Error predicting success rate for {provider_name}: {str(e)}")
         
-        # Calculate feature importance
-        feature_importance = {}
+        return ModelPrediction(
+            predicted_response_time=predicted_response_time,
+            predicted_success_rate=predicted_success_rate,
+            confidence_score=confidence_score,
+            feature_importance=self._feature_importance(provider_name)
+        )
+    
+    def predict_performance_batch(self, provider_names: List[str],
+                                  request_data: Dict[str, Any]) -> Dict[str, ModelPrediction]:
+        """
+        Predict performance of several providers for the same request
+        
+        Providers with trained models are scored together: their feature rows
+        differ only in the provider columns, so both targets come out of one
+        einsum over the stacked weights. Other providers go through
+        predict_performance.
+        """
+        now = datetime.utcnow()
+        provider_index = self._provider_index
+        
+        batch = [name for name in provider_names if name in provider_index]
+        if not batch:
+            return {name: self.predict_performance(name, request_data, now) for name in provider_names}
+        
+        X = np.empty((len(batch), 10), dtype=np.float32)
+        X[:, :5] = self._extract_request_features(request_data, now)
+        for i, name in enumerate(batch):
+            X[i, 5:] = self._extract_provider_features(name)
+        
+        rows = np.fromiter((provider_index[name] for name in batch), dtype=np.intp, count=len(batch))
+        predicted_response_times = np.einsum('pi,pi->p', self._rt_weights[rows], X) + self._rt_offsets[rows]
+        predicted_success_rates = np.clip(
+            np.einsum('pi,pi->p', self._sr_weights[rows], X) + self._sr_offsets[rows], 0.0, 1.0
+        )
+        
+        batch_predictions = {
+            name: ModelPrediction(
+                predicted_response_time=response_time,
+                predicted_success_rate=success_rate,
+                confidence_score=1.0,  # Both models available
+                feature_importance=self._feature_importance(name)
+            )
+            for name, response_time, success_rate in zip(
+                batch, predicted_response_times.tolist(), predicted_success_rates.tolist()
+            )
+        }
+        
+        return {
+            name: batch_predictions[name] if name in batch_predictions
+            else self.predict_performance(name, request_data, now)
+            for name in provider_names
+        }
+    
+    def _store_model_row(self, provider_name: str):
+        """Write a provider's trained model parameters into the stacked arrays"""
+        rt_model = self.response_time_models.get(provider_name)
+        sr_model = self.success_rate_models.get(provider_name)
+        if not (rt_model and rt_model.is_trained and sr_model and sr_model.is_trained):
+            return
+        
+        row = self._provider_index.get(provider_name)
+        if row is None:
+            # New providers are rare, so grow the arrays by one row
+            self._provider_index[provider_name] = len(self._provider_index)
+            self._rt_weights = np.vstack([self._rt_weights, rt_model._scaled_weights])
+            self._rt_offsets = np.append(self._rt_offsets, rt_model._pred_offset)
+            self._sr_weights = np.vstack([self._sr_weights, sr_model._scaled_weights])
+            self._sr_offsets = np.append(self._sr_offsets, sr_model._pred_offset)
+        else:
+            self._rt_weights[row] = rt_model._scaled_weights
+            self._rt_offsets[row] = rt_model._pred_offset
+            self._sr_weights[row] = sr_model._scaled_weights
+            self._sr_offsets[row] = sr_model._pred_offset
+    
+    def _reset_model_rows(self):
+        """Empty the stacked model arrays"""
+        self._provider_index = {}
+        self._rt_weights = np.empty((0, 10), dtype=np.float32)
+        self._rt_offsets = np.empty(0, dtype=np.float64)
+        self._sr_weights = np.empty((0, 10), dtype=np.float32)
+        self._sr_offsets = np.empty(0, dtype=np.float64)
+    
+    def _feature_importance(self, provider_name: str) -> Mapping[str, float]:
+        """Get feature importance of a provider's response time model by feature name"""
+        # Importance only changes when the model is retrained or loaded
+        if provider_name in self._feature_importance_cache:
+            return self._feature_importance_cache[provider_name]
+        
+        feature_importance: Mapping[str, float] = {}
         if provider_name in self.response_time_models:
             try:
                 importance = self.response_time_models[provider_name].get_feature_importance()
-                feature_names = [
-                    'request_length', 'request_complexity', 'task_type', 'time_of_day',
-                    'day_of_week', 'historical_response_time', 'historical_success_rate',
-                    'recent_error_rate', 'provider_load', 'request_similarity'
-                ]
-                feature_importance = {name: float(imp) for name, imp in zip(feature_names, importance)}
+                feature_importance = FeatureImportance(importance)
+                self._feature_importance_cache[provider_name] = feature_importance
             except Exception as e:
                 logger.warning(f"Error calculating feature importance for {provider_name}: {str(e)}")
         
-        return ModelPrediction(
-            predicted_response_time=predicted_response_time,
-            predicted_success_rate=predicted_success_rate,
-            confidence_score=confidence_score,
-            feature_importance=feature_importance
-        )
+        return feature_importance
     
     def get_model_stats(self) -> Dict[str, Any]:
         """Get statistics about the trained models"""
@@ -390,23 +632,25 @@ class PerformancePredictor:
             for provider, model in self.response_time_models.items():
                 if model.is_trained:
                     model_data['response_time_models'][provider] = {
-                        'weights': model.weights.tolist() if model.weights is not None else None,
+                        'weights': model.weights,
                         'bias': float(model.bias) if model.bias is not None else None,
-                        'feature_means': model.feature_means.tolist() if model.feature_means is not None else None,
-                        'feature_stds': model.feature_stds.tolist() if model.feature_stds is not None else None
+                        'feature_means': model.feature_means,
+                        'feature_stds': model.feature_stds
                     }
             
             for provider, model in self.success_rate_models.items():
                 if model.is_trained:
                     model_data['success_rate_models'][provider] = {
-                        'weights': model.weights.tolist() if model.weights is not None else None,
+                        'weights': model.weights,
                         'bias': float(model.bias) if model.bias is not None else None,
-                        'feature_means': model.feature_means.tolist() if model.feature_means is not None else None,
-                        'feature_stds': model.feature_stds.tolist() if model.feature_stds is not None else None
+                        'feature_means': model.feature_means,
+                        'feature_stds': model.feature_stds
                     }
             
-            with open(filepath, 'w') as f:
-                json.dump(model_data, f, indent=2)
+            # orjson writes the numpy arrays (and datetimes in feature_stats)
+            # directly, without converting them to Python objects first
+            with open(filepath, 'wb') as f:
+                f.write(orjson.dumps(model_data, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_INDENT_2))
             
             logger.info(f"Models saved to {filepath}")
             
@@ -416,8 +660,8 @@ class PerformancePredictor:
     def load_models(self, filepath: str):
         """Load trained models from file"""
         try:
-            with open(filepath, 'r') as f:
-                model_data = json.load(f)
+            with open(filepath, 'rb') as f:
+                model_data = orjson.loads(f.read())
             
             # Load feature stats and encoding
             self.feature_stats = model_data.get('feature_stats', {})
@@ -431,10 +675,13 @@ class PerformancePredictor:
             for provider, model_params in model_data.get('response_time_models', {}).items():
                 model = SimpleLinearRegression()
                 if model_params['weights'] is not None:
-                    model.weights = np.array(model_params['weights'])
+                    model.weights = np.array(model_params['weights'], dtype=np.float32)
                     model.bias = model_params['bias']
-                    model.feature_means = np.array(model_params['feature_means'])
-                    model.feature_stds = np.array(model_params['feature_stds'])
+                    model.set_feature_stats(
+                        np.array(model_params['feature_means']),
+                        np.array(model_params['feature_stds'])
+                    )
+                    model._precompute_prediction_params()
                     model.is_trained = True
                 self.response_time_models[provider] = model
             
@@ -442,13 +689,20 @@ class PerformancePredictor:
             for provider, model_params in model_data.get('success_rate_models', {}).items():
                 model = SimpleLinearRegression()
                 if model_params['weights'] is not None:
-                    model.weights = np.array(model_params['weights'])
+                    model.weights = np.array(model_params['weights'], dtype=np.float32)
                     model.bias = model_params['bias']
-                    model.feature_means = np.array(model_params['feature_means'])
-                    model.feature_stds = np.array(model_params['feature_stds'])
+                    model.set_feature_stats(
+                        np.array(model_params['feature_means']),
+                        np.array(model_params['feature_stds'])
+                    )
+                    model._precompute_prediction_params()
                     model.is_trained = True
                 self.success_rate_models[provider] = model
             
+            self._reset_model_rows()
+            for provider in self.response_time_models:
+                self._store_model_row(provider)
+            self._feature_importance_cache.clear()
             logger.info(f"Models loaded from {filepath}")
             
         except Exception as e:
@@ -0,0 +1,54 @@
+"""
+Request-scoped context shared across the request handling path
+"""
+import re
+import uuid
+from contextvars import ContextVar
+from typing import Optional
+
+# Server-generated UUID, set once per request by the HTTP middleware; copied
+# automatically into any task spawned while handling the request (e.g. via
+# asyncio.gather). Stored as UsageRecord.request_id, so it is never taken
+# from the client.
+REQUEST_ID: ContextVar[str] = ContextVar("request_id")
+
+# Client-supplied X-Request-ID, when valid; only echoed back and logged
+CORRELATION_ID: ContextVar[Optional[str]] = ContextVar("correlation_id", default=None)
+
+# Client X-Request-ID values are only accepted when they look like an opaque token
+_CORRELATION_ID_RE = re.compile(r"[A-Za-z0-9._-]{1,128}")
+
+
+def new_request_id() -> str:
+    """Generate a server-side request ID"""
+    return str(uuid.uuid4())
+
+
+def resolve_correlation_id(header_value: Optional[str]) -> Optional[str]:
+    """
+    Validate a client-supplied X-Request-ID header
+
+    Args:
+        header_value: Raw X-Request-ID header sent by the client, if any
+
+    Returns:
+        The header value when it is a short token of safe characters,
+        otherwise None
+    """
+    if header_value and _CORRELATION_ID_RE.fullmatch(header_value):
+        return header_value
+    return None
+
+
+def get_request_id() -> str:
+    """
+    Get the ID of the request currently being handled
+
+    Falls back to a freshly generated ID when called outside of a request,
+    e.g. from background jobs. The fallback is not bound to the context, so
+    each call there gets its own ID.
+    """
+    request_id = REQUEST_ID.get(None)
+    if request_id is None:
+        return new_request_id()
+    return request_id
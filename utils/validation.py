@@ -3,10 +3,25 @@ Input validation utilities for API endpoints
 """
 import re
 import html
+import json
 from typing import Any, Dict, List, Optional
 from pydantic import BaseModel, validator
 from fastapi import HTTPException, status
 
+# Patterns compiled once at import rather than looked up on every call
+_EMAIL_RE = re.compile(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$')
+# Alphanumeric, spaces, hyphens, underscores
+_NAME_RE = re.compile(r'^[a-zA-Z0-9\s\-_]+$')
+_SEARCH_STRIP_RE = re.compile(r'[^\w\s\-]')
+
+# Character classes a strong password must draw from, as bit flags
+_HAS_UPPER = 1
+_HAS_LOWER = 2
+_HAS_DIGIT = 4
+_HAS_SPECIAL = 8
+_HAS_ALL = _HAS_UPPER | _HAS_LOWER | _HAS_DIGIT | _HAS_SPECIAL
+_PASSWORD_SPECIAL_CHARS = frozenset('!@#$%^&*(),.?":{}|<>')
+
 class APIValidationError(HTTPException):
     """Custom validation error"""
     def __init__(self, detail: str):
@@ -20,8 +35,7 @@ def sanitize_html_input(text: str) -> str:
 
 def validate_email(email: str) -> bool:
     """Validate email format"""
-    pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-    return bool(re.match(pattern, email))
+    return bool(_EMAIL_RE.match(email))
 
 def validate_password_strength(password: str) -> List[str]:
     """Validate password strength and return list of errors"""
@@ -30,16 +44,32 @@ def validate_password_strength(password: str) -> List[str]:
     if len(password) < 8:
         errors.append("Password must be at least 8 characters long")
     
-    if not re.search(r'[A-Z]', password):
+    # Classify every character in a single pass, stopping once all are seen
+    flags = 0
+    for char in password:
+        if 'A' <= char <= 'Z':
+            flags |= _HAS_UPPER
+        elif 'a' <= char <= 'z':
+            flags |= _HAS_LOWER
+        elif char.isdecimal():
+            flags |= _HAS_DIGIT
+        elif char in _PASSWORD_SPECIAL_CHARS:
+            flags |= _HAS_SPECIAL
+        else:
+            continue
+        if flags == _HAS_ALL:
+            break
+    
+    if not flags & _HAS_UPPER:
         errors.append("Password must contain at least one uppercase letter")
     
-    if not re.search(r'[a-z]', password):
+    if not flags & _HAS_LOWER:
         errors.append("Password must contain at least one lowercase letter")
     
-    if not re.search(r'\d', password):
+    if not flags & _HAS_DIGIT:
         errors.append("Password must contain at least one digit")
     
-    if not re.search(r'[!@#$%^&*(),.?":{}|<>]', password):
+    if not flags & _HAS_SPECIAL:
         errors.append("Password must contain at least one special character")
     
     return errors
@@ -51,8 +81,7 @@ def validate_organization_name(name: str) -> bool:
     if len(name) > 100:
         return False
     # Allow alphanumeric, spaces, hyphens, underscores
-    pattern = r'^[a-zA-Z0-9\s\-_]+$'
-    return bool(re.match(pattern, name))
+    return bool(_NAME_RE.match(name))
 
 def validate_api_key_name(name: str) -> bool:
     """Validate API key name"""
@@ -61,18 +90,14 @@ def validate_api_key_name(name: str) -> bool:
     if len(name) > 50:
         return False
     # Allow alphanumeric, spaces, hyphens, underscores
-    pattern = r'^[a-zA-Z0-9\s\-_]+$'
-    return bool(re.match(pattern, name))
+    return bool(_NAME_RE.match(name))
 
 def validate_json_size(data: Dict[Any, Any], max_size_kb: int = 100) -> bool:
     """Validate JSON payload size"""
-    import json
-    import sys
-    
+    # One-shot dumps uses the C encoder; json.dump to a stream never does.
+    # Non-ASCII is escaped by default, so characters == bytes
     try:
-        json_str = json.dumps(data)
-        size_kb = sys.getsizeof(json_str) / 1024
-        return size_kb <= max_size_kb
+        return len(json.dumps(data)) <= max_size_kb * 1024
     except Exception:
         return False
 
@@ -83,8 +108,7 @@ def validate_workflow_name(name: str) -> bool:
     if len(name) > 100:
         return False
     # Allow alphanumeric, spaces, hyphens, underscores
-    pattern = r'^[a-zA-Z0-9\s\-_]+$'
-    return bool(re.match(pattern, name))
+    return bool(_NAME_RE.match(name))
 
 class ContactFormValidator(BaseModel):
     """Contact form validation"""
@@ -149,7 +173,7 @@ def sanitize_search_query(query: str) -> str:
         return ""
     
     # Remove special characters that could be used for injection
-    sanitized = re.sub(r'[^\w\s\-]', '', query)
+    sanitized = _SEARCH_STRIP_RE.sub('', query)
     return sanitized.strip()[:100]  # Limit length
 
 def validate_pagination_params(page: int, limit: int) -> Dict[str, int]: